@@ -0,0 +1,172 @@
+import os
+import re
+import json
+import time
+import argparse
+import logging
+
+from core.cache import ExtractionCache
+from document_processor import GenericDocumentIntelligence
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def load_jobs(source: str):
+    """
+    Load job specs as (job_id, input_data) pairs.
+    `source` is either a directory of input.json-shaped files or a JSONL file
+    with one such object per line. A job's id comes from its "request_id",
+    then challenge_info.challenge_id, then the file name or line number.
+    """
+    jobs = []
+    if os.path.isdir(source):
+        for fname in sorted(os.listdir(source)):
+            if not fname.endswith(".json"):
+                continue
+            with open(os.path.join(source, fname), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            jobs.append((_job_id(data, os.path.splitext(fname)[0]), data))
+    else:
+        with open(source, 'r', encoding='utf-8') as f:
+            for line_num, line in enumerate(f, start=1):
+                if line.strip():
+                    data = json.loads(line)
+                    jobs.append((_job_id(data, f"job_{line_num:04d}"), data))
+    return jobs
+
+
+def _job_id(data, default):
+    return str(data.get("request_id") or data.get("challenge_info", {}).get("challenge_id") or default)
+
+
+def _output_name(job_id, taken):
+    """A file-name-safe, unique version of job_id; `taken` collects the names handed out.
+
+    Anything outside [A-Za-z0-9._-] becomes "_" and leading dots are dropped,
+    so an id like "../../x" can't leave output_dir. A repeated id gets a
+    "_2", "_3", ... suffix instead of overwriting the earlier job's output.
+    """
+    base = re.sub(r"[^A-Za-z0-9._-]", "_", job_id).lstrip(".") or "job"
+    name = base
+    n = 1
+    while name in taken:
+        n += 1
+        name = f"{base}_{n}"
+    taken.add(name)
+    return name
+
+
+def run_batch(processor: GenericDocumentIntelligence, jobs, input_dir: str, output_dir: str,
+              scoring: str = "index"):
+    """
+    Run every job against one shared extraction pass.
+    The union of referenced PDFs is extracted exactly once; ranking and
+    subsection extraction then run per job and each writes <job_id>.json, with
+    the id made file-name-safe and unique (see _output_name). Returns
+    per-stage throughput.
+    With scoring="bm25" or "compat", jobs over the same documents are ranked
+    together in one vectorized pass (see rank_many) instead of one index per job.
+    """
+    parsed_jobs = []
+    union = []
+    seen = set()
+    taken = set()
+    for job_id, data in jobs:
+        name = _output_name(job_id, taken)
+        if name != job_id:
+            logger.warning(f"Job id {job_id!r} written as {name}.json")
+        job_id = name
+        persona, job, docs = processor.parse_job(data)
+        fnames = processor.available_documents(input_dir, docs)
+        parsed_jobs.append((job_id, persona, job, docs, fnames))
+        for fname in fnames:
+            if fname not in seen:
+                seen.add(fname)
+                union.append(fname)
+
+    start = time.perf_counter()
+    sections_by_doc = {}
+    extracted = processor.extract_documents([os.path.join(input_dir, f) for f in union])
+    for fname, sections in zip(union, extracted):
+        for s in sections:
+            s["document"] = fname
+        sections_by_doc[fname] = sections
+    extract_time = time.perf_counter() - start
+
+    os.makedirs(output_dir, exist_ok=True)
+    rank_time = write_time = 0.0
+    ranked_by_job = {}
+    if scoring != "index":
+        start = time.perf_counter()
+        groups = {}
+        for job_id, persona, job, docs, fnames in parsed_jobs:
+            groups.setdefault(tuple(fnames), []).append((job_id, persona, job))
+        for fnames, group in groups.items():
+            job_sections = [s for fname in fnames for s in sections_by_doc[fname]]
+            ranked = processor.rank_many(job_sections, [(persona, job) for _, persona, job in group], mode=scoring)
+            ranked_by_job.update(zip((job_id for job_id, _, _ in group), ranked))
+        rank_time += time.perf_counter() - start
+
+    for job_id, persona, job, docs, fnames in parsed_jobs:
+        start = time.perf_counter()
+        ranked = ranked_by_job.get(job_id)
+        if ranked is None:
+            job_sections = [s for fname in fnames for s in sections_by_doc[fname]]
+            ranked = processor.rank_sections(job_sections, persona, job)
+        subs = processor.extract_subsections(ranked, query=processor.query_for(persona, job))
+        result = processor.build_output([d["filename"] for d in docs], persona, job, ranked, subs)
+        rank_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        with open(os.path.join(output_dir, f"{job_id}.json"), 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        write_time += time.perf_counter() - start
+
+    total_sections = sum(len(s) for s in sections_by_doc.values())
+    return {
+        "jobs": len(parsed_jobs),
+        "documents": len(union),
+        "document_references": sum(len(j[4]) for j in parsed_jobs),
+        "sections": total_sections,
+        "extract_seconds": round(extract_time, 4),
+        "extract_docs_per_sec": round(len(union) / extract_time, 2) if extract_time else None,
+        "rank_seconds": round(rank_time, 4),
+        "rank_jobs_per_sec": round(len(parsed_jobs) / rank_time, 2) if rank_time else None,
+        "write_seconds": round(write_time, 4),
+    }
+
+
+def main():
+    """
+    Batch entry point: run many persona/job specs over overlapping PDFs,
+    extracting each referenced PDF once and writing one output per job.
+    """
+    parser = argparse.ArgumentParser(description="Batch multi-persona document intelligence")
+    parser.add_argument("jobs", help="directory of input.json-shaped files, or a JSONL file of job specs")
+    parser.add_argument("--input-dir", default=os.path.join(os.getcwd(), "input"),
+                        help="directory containing the referenced PDFs")
+    parser.add_argument("--output-dir", default=os.path.join(os.getcwd(), "output"))
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="processes used to extract documents in parallel (default: CPU count)")
+    parser.add_argument("--cache", metavar="PATH", help="SQLite extraction cache")
+    parser.add_argument("--scoring", choices=("index", "bm25", "compat"), default="index",
+                        help="per-job BM25F index (index), or one vectorized pass per document set: "
+                             "sparse BM25 (bm25) or the keyword-overlap score (compat); needs numpy and scipy")
+    args = parser.parse_args()
+
+    cache = ExtractionCache(args.cache) if args.cache else None
+    processor = GenericDocumentIntelligence(workers=args.workers, cache=cache)
+    jobs = load_jobs(args.jobs)
+    stats = run_batch(processor, jobs, args.input_dir, args.output_dir, args.scoring)
+
+    logger.info(f"Extracted {stats['documents']} unique document(s) for {stats['document_references']} "
+                f"reference(s) in {stats['extract_seconds']}s ({stats['extract_docs_per_sec']} docs/s)")
+    logger.info(f"Ranked {stats['jobs']} job(s) in {stats['rank_seconds']}s ({stats['rank_jobs_per_sec']} jobs/s)")
+    logger.info(f"Wrote {stats['jobs']} output file(s) in {stats['write_seconds']}s")
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Reproducible per-stage benchmark over the bundled and synthetic PDF corpora.
+
+Each stage is timed on its own, on inputs materialized by the stage before
+it: open, get_text, boilerplate stripping, span merge, is_heading, outline
+leveling, section classification, section merge, ranking and subsection
+extraction. Results
+are written as JSON tagged with the git commit, so two runs can be diffed:
+
+    python -m benchmarks.run                      # writes benchmarks/results/<commit>.json
+    python -m benchmarks.run --synthetic-pages 500 --synthetic-docs 3
+    python -m benchmarks.run --compare OLD.json NEW.json
+"""
+import argparse
+import contextlib
+import glob
+import json
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime
+
+from benchmarks.synthetic import generate_corpus
+from core.boilerplate import find_boilerplate
+from core.extractor import _detect_headings, _merge_page_spans
+from core.font_profile import FontProfile, page_has_heading_candidates
+from core.outline import level_headings
+from core.parsed_document import ParsedDocument
+from document_processor import GenericDocumentIntelligence
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PERSONA = "Travel Planner"
+JOB = "Plan a trip of 4 days for a group of 10 college friends."
+
+
+class StageTimer:
+    def __init__(self):
+        self.seconds = {}
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - start
+
+
+def benchmark_corpus(pdf_paths, repeat=1):
+    """Time every pipeline stage over pdf_paths; returns the best of `repeat` runs per stage."""
+    best = {}
+    counts = {}
+    for _ in range(repeat):
+        timer = StageTimer()
+        processor = GenericDocumentIntelligence()
+        all_sections = []
+        counts = {"documents": len(pdf_paths), "pages": 0, "spans": 0, "headings": 0, "sections": 0}
+
+        for path in pdf_paths:
+            with timer.stage("open"):
+                parsed = ParsedDocument(path)
+            with parsed:
+                with timer.stage("get_text"):
+                    pages = [(page_num, parsed.page_dict(page_num)) for page_num in range(1, parsed.page_count + 1)]
+                counts["pages"] += len(pages)
+
+                # Same preparation as extract_headings_for_pages: boilerplate
+                # stripped, pages without a possible heading skipped
+                with timer.stage("boilerplate"):
+                    boilerplate = find_boilerplate(parsed)
+                    min_size = FontProfile.from_sample(parsed).heading_min_size()
+                    stripped = [(page_num, boilerplate.strip(page_dict)) for page_num, page_dict in pages]
+                    kept = [(page_num, blocks) for page_num, blocks in stripped if page_has_heading_candidates(blocks)]
+
+                with timer.stage("span_merge"):
+                    merged = [(page_num, _merge_page_spans(blocks)) for page_num, blocks in kept]
+                counts["spans"] += sum(len(spans) for _, spans in merged)
+
+                with timer.stage("is_heading"):
+                    headings = [h for page_num, spans in merged for h in _detect_headings(spans, page_num, min_size)]
+                counts["headings"] += len(headings)
+
+                with timer.stage("outline_leveling"):
+                    level_headings(headings)
+
+                with timer.stage("section_classify"):
+                    classified = list(processor._iter_classified_spans(parsed))
+                with timer.stage("section_merge"):
+                    sections = list(processor._assemble_sections(classified))
+                for s in sections:
+                    s["document"] = os.path.basename(path)
+                all_sections.extend(sections)
+
+        counts["sections"] = len(all_sections)
+        with timer.stage("ranking"):
+            ranked = processor.rank_sections(all_sections, PERSONA, JOB)
+        with timer.stage("subsections"):
+            processor.extract_subsections(ranked, query=processor.query_for(PERSONA, JOB))
+
+        for name, seconds in timer.seconds.items():
+            best[name] = min(seconds, best.get(name, float("inf")))
+
+    stages = {name: round(seconds, 6) for name, seconds in best.items()}
+    stages["total"] = round(sum(best.values()), 6)
+    return {"counts": counts, "stages": stages}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(old_path, new_path):
+    with open(old_path, encoding='utf-8') as f:
+        old = json.load(f)
+    with open(new_path, encoding='utf-8') as f:
+        new = json.load(f)
+    print(f"{old['commit']} -> {new['commit']}")
+    for corpus, result in new["corpora"].items():
+        if corpus not in old["corpora"]:
+            continue
+        print(f"\n{corpus}")
+        for stage, seconds in result["stages"].items():
+            before = old["corpora"][corpus]["stages"].get(stage)
+            if before:
+                print(f"  {stage:<18} {before * 1000:10.2f} ms -> {seconds * 1000:10.2f} ms  ({seconds / before:5.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pdfs", default="input/*.pdf", help="glob of bundled PDFs")
+    parser.add_argument("--synthetic-docs", type=int, default=3)
+    parser.add_argument("--synthetic-pages", type=int, default=100)
+    parser.add_argument("--synthetic-headings-per-page", type=int, default=3)
+    parser.add_argument("--corpus-dir", default=os.path.join(BENCH_DIR, "corpus"))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two results files and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    corpora = {"bundled": sorted(glob.glob(args.pdfs))}
+    if args.synthetic_docs > 0:
+        corpora["synthetic"] = generate_corpus(args.corpus_dir, docs=args.synthetic_docs,
+                                               pages=args.synthetic_pages,
+                                               headings_per_page=args.synthetic_headings_per_page)
+
+    commit = _git_commit()
+    results = {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "corpora": {name: benchmark_corpus(paths, args.repeat) for name, paths in corpora.items() if paths},
+    }
+
+    output = args.output or os.path.join(BENCH_DIR, "results", f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps(results["corpora"], indent=2))
+    print(f"Saved results to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Compare the sentence-likeness backends on the bundled PDFs.
+
+Reports how often the rule backend agrees with spaCy, both on the raw colon
+spans is_heading would ask about and on the final heading lists, plus the
+time each backend takes. Run from the repository root:
+
+    python -m benchmarks.sentence_backends [--pdfs "input/*.pdf"]
+"""
+import argparse
+import glob
+import json
+import time
+
+from core.extractor import extract_pdf_headings
+from core.parsed_document import ParsedDocument
+from nlp import rule_backend, sentence_detector
+from utils.heading_rules import _needs_sentence_check
+
+
+def collect_candidate_texts(pdf_paths):
+    texts = []
+    for path in pdf_paths:
+        with ParsedDocument(path) as parsed:
+            for _, blocks in parsed.iter_pages():
+                for block in blocks:
+                    for line in block.get("lines", []):
+                        for span in line.get("spans", []):
+                            font = span.get("font", "").lower()
+                            text = span.get("text", "").strip()
+                            if _needs_sentence_check(text, "bold" in font or "black" in font):
+                                texts.append(text)
+    return texts
+
+
+def time_headings(pdf_paths, backend):
+    sentence_detector.set_backend(backend)
+    start = time.perf_counter()
+    headings = {path: [(h["page"], h["text"]) for h in extract_pdf_headings(path)] for path in pdf_paths}
+    return headings, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pdfs", default="input/*.pdf", help="glob of PDFs to benchmark")
+    args = parser.parse_args()
+
+    pdf_paths = sorted(glob.glob(args.pdfs))
+    texts = collect_candidate_texts(pdf_paths)
+    report = {"pdfs": len(pdf_paths), "candidate_spans": len(texts)}
+
+    start = time.perf_counter()
+    rule_labels = rule_backend.classify(texts)
+    report["rules_classify_seconds"] = round(time.perf_counter() - start, 6)
+    rule_headings, report["rules_headings_seconds"] = time_headings(pdf_paths, "rules")
+
+    try:
+        from nlp import spacy_backend
+        start = time.perf_counter()
+        spacy_backend.get_nlp()
+        report["spacy_load_seconds"] = round(time.perf_counter() - start, 4)
+    except (ImportError, OSError) as e:
+        report["spacy_unavailable"] = str(e)
+        print(json.dumps(report, indent=2))
+        return
+
+    start = time.perf_counter()
+    spacy_labels = spacy_backend.classify(texts)
+    report["spacy_classify_seconds"] = round(time.perf_counter() - start, 6)
+    spacy_headings, report["spacy_headings_seconds"] = time_headings(pdf_paths, "spacy")
+
+    agree = sum(a == b for a, b in zip(rule_labels, spacy_labels))
+    report["span_agreement"] = round(agree / len(texts), 4) if texts else None
+    report["disagreements"] = [t for t, a, b in zip(texts, rule_labels, spacy_labels) if a != b]
+
+    same_docs = sum(rule_headings[p] == spacy_headings[p] for p in pdf_paths)
+    report["documents_with_identical_headings"] = f"{same_docs}/{len(pdf_paths)}"
+    if report["rules_classify_seconds"]:
+        report["classify_speedup"] = round(report["spacy_classify_seconds"] / report["rules_classify_seconds"], 1)
+    if report["rules_headings_seconds"]:
+        report["headings_speedup"] = round(report["spacy_headings_seconds"] / report["rules_headings_seconds"], 2)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
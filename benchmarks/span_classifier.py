@@ -0,0 +1,90 @@
+"""
+Microbenchmark for the span classifier behind GenericDocumentIntelligence.
+
+Times the previous per-span implementation (pattern lists rebuilt and matched
+as strings on every call) against core.span_classifier.classify_spans on
+every span of the sample PDFs, checks both agree, and reports ns per span.
+Run from the repository root:
+
+    python -m benchmarks.span_classifier [--pdfs "input/*.pdf"] [--repeat 20]
+"""
+import argparse
+import glob
+import json
+import re
+import time
+
+from core.parsed_document import ParsedDocument
+from core.span_classifier import classify_spans
+
+
+def legacy_classify(text, font_size, is_bold):
+    if len(text) < 5 or text.isdigit():
+        return None
+
+    heading_patterns = [r'^[A-Z][A-Za-z\s]+$', r'^\d+\.?\s+[A-Z]', r'^[IVX]+\.?\s+[A-Z]', r'^[A-Z]{2,}']
+    content_indicators = [r'\.\s+[A-Z]', r',\s+', r';\s+']
+
+    is_likely_heading = any(re.match(p, text) for p in heading_patterns) or font_size > 12 or is_bold
+    if any(re.search(p, text) for p in content_indicators):
+        is_likely_heading = False
+
+    if not is_likely_heading:
+        return "content"
+    if font_size > 16 or text.isupper() or re.match(r'^\d+\.\s+[A-Z]', text):
+        return "H1"
+    elif font_size > 14 or is_bold or re.match(r'^[A-Z]\.\s+[A-Z]', text):
+        return "H2"
+    return "H3"
+
+
+def collect_pages(pdf_paths):
+    pages = []
+    for path in pdf_paths:
+        with ParsedDocument(path) as parsed:
+            for _, blocks in parsed.iter_pages():
+                texts, sizes, bolds = [], [], []
+                for block in blocks:
+                    for line in block.get("lines", []):
+                        for span in line["spans"]:
+                            text = span["text"].strip()
+                            if len(text) >= 3:
+                                texts.append(text)
+                                sizes.append(span["size"])
+                                bolds.append(bool(span["flags"] & 2**4))
+                pages.append((texts, sizes, bolds))
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pdfs", default="input/*.pdf", help="glob of PDFs to benchmark")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    pages = collect_pages(sorted(glob.glob(args.pdfs)))
+    span_count = sum(len(texts) for texts, _, _ in pages)
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        legacy = [[legacy_classify(*span) for span in zip(*page)] for page in pages]
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        batched = [classify_spans(*page)[0] for page in pages]
+    batched_seconds = time.perf_counter() - start
+
+    runs = span_count * args.repeat or 1
+    print(json.dumps({
+        "pages": len(pages),
+        "spans": span_count,
+        "identical": legacy == batched,
+        "legacy_ns_per_span": round(legacy_seconds / runs * 1e9),
+        "batched_ns_per_span": round(batched_seconds / runs * 1e9),
+        "speedup": round(legacy_seconds / batched_seconds, 2) if batched_seconds else None,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
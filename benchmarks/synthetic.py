@@ -0,0 +1,116 @@
+"""
+Generate synthetic PDFs with PyMuPDF for benchmarking.
+
+Page count, heading density, body length, fonts and sizes are all
+controllable, and output is deterministic for a given seed. Run from the
+repository root:
+
+    python -m benchmarks.synthetic benchmarks/corpus --docs 5 --pages 200
+"""
+import argparse
+import hashlib
+import inspect
+import os
+import random
+
+import fitz
+
+# Base-14 fonts, so generation needs no font files
+HEADING_FONTS = ("hebo", "tibo")
+BODY_FONTS = ("helv", "tiro")
+
+WORDS = """
+travel city coast village market harbour museum festival wine cuisine history
+culture beach hotel restaurant route museum garden castle cathedral river
+mountain budget season weather train ferry ticket guide local tradition
+""".split()
+
+
+def _sentence(rng, min_words=8, max_words=18):
+    words = rng.choices(WORDS, k=rng.randint(min_words, max_words))
+    return " ".join(words).capitalize() + "."
+
+
+def generate_pdf(path, pages=10, headings_per_page=3, body_lines=6,
+                 heading_sizes=(18, 14, 12), body_size=10,
+                 heading_fonts=HEADING_FONTS, body_fonts=BODY_FONTS, seed=0):
+    """Write one synthetic PDF and return the number of headings placed."""
+    rng = random.Random(seed)
+    doc = fitz.open()
+    heading_count = 0
+    line_height = body_size * 1.4
+
+    for page_num in range(pages):
+        page = doc.new_page()
+        y = 72.0
+        bottom = page.rect.height - 72
+        # Running footer, repeated on every page like real reports
+        page.insert_text((72, page.rect.height - 36), f"Synthetic Report - Page {page_num + 1}",
+                         fontname=body_fonts[0], fontsize=8)
+
+        for h in range(headings_per_page):
+            level = rng.randrange(len(heading_sizes))
+            size = heading_sizes[level]
+            if y + size + line_height * body_lines > bottom:
+                break
+            title = " ".join(w.capitalize() for w in rng.choices(WORDS, k=rng.randint(2, 5)))
+            page.insert_text((72, y + size), f"{page_num + 1}.{h + 1} {title}",
+                             fontname=heading_fonts[level % len(heading_fonts)], fontsize=size)
+            heading_count += 1
+            y += size * 1.8
+
+            body_font = body_fonts[rng.randrange(len(body_fonts))]
+            for _ in range(body_lines):
+                page.insert_text((72, y), _sentence(rng), fontname=body_font, fontsize=body_size)
+                y += line_height
+            y += line_height
+
+    doc.save(path)
+    doc.close()
+    return heading_count
+
+
+def _corpus_name(**params):
+    """File name stem that changes with any generate_pdf parameter, defaults included."""
+    bound = inspect.signature(generate_pdf).bind(None, **params)
+    bound.apply_defaults()
+    settings = {k: v for k, v in bound.arguments.items() if k != "path"}
+    digest = hashlib.sha256(repr(sorted(settings.items())).encode("utf-8")).hexdigest()[:10]
+    return f"synthetic_{params['pages']}p_{params['headings_per_page']}h_{params['seed']:03d}_{digest}"
+
+
+def generate_corpus(output_dir, docs=5, pages=50, headings_per_page=3, seed=0, **kwargs):
+    """Generate `docs` PDFs into output_dir (skipping ones already present) and return their paths.
+
+    File names carry a hash of every generation parameter, so a file is only
+    reused when it was generated with the same settings.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for i in range(docs):
+        params = dict(kwargs, pages=pages, headings_per_page=headings_per_page, seed=seed + i)
+        path = os.path.join(output_dir, _corpus_name(**params) + ".pdf")
+        if not os.path.exists(path):
+            generate_pdf(path, **params)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("output_dir")
+    parser.add_argument("--docs", type=int, default=5)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--headings-per-page", type=int, default=3)
+    parser.add_argument("--body-lines", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    paths = generate_corpus(args.output_dir, docs=args.docs, pages=args.pages,
+                            headings_per_page=args.headings_per_page, seed=args.seed,
+                            body_lines=args.body_lines)
+    print("\n".join(paths))
+
+
+if __name__ == "__main__":
+    main()
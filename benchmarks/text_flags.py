@@ -0,0 +1,70 @@
+"""
+Measure what the central text-extraction options save over get_text defaults.
+
+For each PDF, times page.get_text("dict") with PyMuPDF's default flags
+against core.text_options.SPANS, checks that the span text and origins the
+extractors read are unchanged, and counts the image blocks no longer decoded.
+Run from the repository root:
+
+    python -m benchmarks.text_flags [--pdfs "input/*.pdf"] [--repeat 5]
+"""
+import argparse
+import glob
+import json
+import os
+import time
+
+import fitz
+
+from core.text_options import SPANS, TextOptions
+
+DEFAULTS = TextOptions(flags=fitz.TEXTFLAGS_DICT)
+
+
+def _time_pages(doc, options, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = [options.extract(page) for page in doc]
+    return time.perf_counter() - start, results
+
+
+def _span_view(results):
+    return [
+        [(span["text"], span["origin"]) for block in page["blocks"]
+         for line in block.get("lines", []) for span in line["spans"]]
+        for page in results
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pdfs", default="input/*.pdf", help="glob of PDFs to benchmark")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    report = []
+    for path in sorted(glob.glob(args.pdfs)):
+        with fitz.open(path) as doc:
+            default_seconds, default_results = _time_pages(doc, DEFAULTS, args.repeat)
+            spans_seconds, spans_results = _time_pages(doc, SPANS, args.repeat)
+        report.append({
+            "pdf": os.path.basename(path),
+            "pages": len(default_results),
+            "image_blocks_skipped": sum(b["type"] == 1 for page in default_results for b in page["blocks"]),
+            "default_ms": round(default_seconds / args.repeat * 1000, 2),
+            "spans_ms": round(spans_seconds / args.repeat * 1000, 2),
+            "identical_spans": _span_view(default_results) == _span_view(spans_results),
+        })
+
+    total_default = sum(r["default_ms"] for r in report)
+    total_spans = sum(r["spans_ms"] for r in report)
+    print(json.dumps({
+        "documents": report,
+        "total_default_ms": round(total_default, 2),
+        "total_spans_ms": round(total_spans, 2),
+        "saved_ms": round(total_default - total_spans, 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# core/async_pipeline.py
+
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# Files read at the same time by the prefetch stage
+DEFAULT_READ_CONCURRENCY = 4
+
+
+def read_file(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def parse_executor(workers):
+    """Executor for the CPU stage: one background thread, or a process pool.
+
+    A single thread is enough to overlap parsing with I/O, since file reads
+    and writes release the GIL; more workers need processes.
+    """
+    if workers <= 1:
+        return ThreadPoolExecutor(max_workers=1)
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+async def pipeline(paths, process, write, executor, workers=1, max_pending=None,
+                   read_concurrency=DEFAULT_READ_CONCURRENCY):
+    """Read, process and write every path, yielding (path, written, error, seconds) as each finishes.
+
+    Each document moves through three stages:
+      read     file bytes are prefetched by up to read_concurrency threads
+      process  process(path, data) runs in `executor`, e.g. fitz.open(stream=data)
+      write    write(path, processed) runs in an I/O thread; its return value is yielded
+    At most max_pending documents (default 2 x workers) are anywhere between
+    read and write at once. New reads wait for a slot, so reads and writes
+    overlap with parsing while memory stays bounded. A failure at any stage
+    is yielded as `error` for that path and does not stop the others.
+    """
+    loop = asyncio.get_running_loop()
+    paths = list(paths)
+    slots = asyncio.Semaphore(max_pending or 2 * max(1, workers))
+    reads = asyncio.Semaphore(read_concurrency)
+    finished = asyncio.Queue()
+    io = ThreadPoolExecutor(max_workers=read_concurrency + 1)
+
+    async def handle(path):
+        start = time.perf_counter()
+        try:
+            async with reads:
+                data = await loop.run_in_executor(io, read_file, path)
+            processed = await loop.run_in_executor(executor, process, path, data)
+            del data
+            written = await loop.run_in_executor(io, write, path, processed)
+            await finished.put((path, written, None, time.perf_counter() - start))
+        except Exception as e:
+            await finished.put((path, None, e, time.perf_counter() - start))
+        finally:
+            slots.release()
+
+    async def feed():
+        for path in paths:
+            await slots.acquire()
+            task = asyncio.create_task(handle(path))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+    tasks = set()
+    feeder = asyncio.create_task(feed())
+    try:
+        for _ in paths:
+            yield await finished.get()
+        await feeder
+    finally:
+        # Closed early: stop feeding and let in-flight documents unwind
+        feeder.cancel()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(feeder, *tasks, return_exceptions=True)
+        io.shutdown(wait=False)
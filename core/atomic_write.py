@@ -0,0 +1,36 @@
+# core/atomic_write.py
+
+import contextlib
+import os
+import stat
+import tempfile
+
+# Read once at import, while nothing else can be creating files: os.umask can
+# only be queried by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+@contextlib.contextmanager
+def atomic_write(path, prefix=".tmp-"):
+    """Open a temp file next to `path` for writing text and rename it over `path` on success.
+
+    Readers never see a half-written file. mkstemp creates files 0600, so the
+    temp file first gets the mode of the file it replaces, or 0666 minus the
+    umask, as open() would give a new file.
+    """
+    path = str(path)
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=prefix, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            os.fchmod(f.fileno(), mode)
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -0,0 +1,114 @@
+# core/boilerplate.py
+
+import math
+import re
+from collections import Counter
+
+from core.metrics import current as current_metrics
+
+# Top and bottom share of the page height where running headers, footers and
+# page numbers live; text outside these bands is never treated as boilerplate
+MARGIN_FRACTION = 0.08
+# Pages scanned to find repeated margin text, spread evenly over the document
+SAMPLE_PAGES = 24
+# A margin signature is boilerplate once it appears on this many sampled pages
+MIN_PAGES = 3
+MIN_SHARE = 0.3
+
+_DIGITS = re.compile(r"\d+")
+_SPACE = re.compile(r"\s+")
+
+
+def span_signature(span, page_height):
+    """(normalized text, font, top, bottom) for a span in the margin bands, else None.
+
+    Digits are folded so "Page 3" and "Page 14" match. The x position is left
+    out so centred or right-aligned page numbers, whose width changes with the
+    digit count, still match.
+    """
+    _, y0, _, y1 = span["bbox"]
+    if page_height * MARGIN_FRACTION < y1 and y0 < page_height * (1 - MARGIN_FRACTION):
+        return None
+    text = _SPACE.sub(" ", _DIGITS.sub("#", span["text"])).strip().lower()
+    if not text:
+        return None
+    return (text, span["font"], round(y0), round(y1))
+
+
+def page_signatures(page_dict):
+    height = page_dict["height"]
+    signatures = set()
+    for block in page_dict["blocks"]:
+        for line in block.get("lines", ()):
+            for span in line["spans"]:
+                signature = span_signature(span, height)
+                if signature is not None:
+                    signatures.add(signature)
+    return signatures
+
+
+def sample_pages(page_count):
+    if page_count <= SAMPLE_PAGES:
+        return list(range(1, page_count + 1))
+    step = page_count / SAMPLE_PAGES
+    return [1 + int(i * step) for i in range(SAMPLE_PAGES)]
+
+
+class Boilerplate:
+    """Margin text that repeats across a document's pages.
+
+    Built once per document from a sample of pages, then applied to every
+    page's blocks before span merging and classification. The sample depends
+    only on the page count, so page-sharded workers given the same Boilerplate
+    drop exactly what the serial path drops.
+    """
+
+    __slots__ = ("signatures",)
+
+    def __init__(self, signatures=frozenset()):
+        self.signatures = frozenset(signatures)
+
+    def __bool__(self):
+        return bool(self.signatures)
+
+    def strip(self, page_dict):
+        """The page's blocks without boilerplate spans.
+
+        Blocks and lines are kept (possibly empty) so block indices still match
+        the unfiltered page; pages with nothing to drop are returned as-is.
+        """
+        blocks = page_dict["blocks"]
+        if not self.signatures:
+            return blocks
+        height = page_dict["height"]
+        stripped = []
+        dropped = 0
+        for block in blocks:
+            if "lines" not in block:
+                stripped.append(block)
+                continue
+            lines = []
+            for line in block["lines"]:
+                spans = [s for s in line["spans"] if span_signature(s, height) not in self.signatures]
+                if len(spans) != len(line["spans"]):
+                    dropped += len(line["spans"]) - len(spans)
+                    line = dict(line, spans=spans)
+                lines.append(line)
+            stripped.append(dict(block, lines=lines))
+        if not dropped:
+            return blocks
+        current_metrics().incr("boilerplate_spans", dropped)
+        return stripped
+
+
+def find_boilerplate(parsed, memoize=True):
+    """Boilerplate for an open ParsedDocument."""
+    pages = sample_pages(parsed.page_count)
+    if len(pages) < MIN_PAGES:
+        return Boilerplate()
+    with current_metrics().stage("boilerplate"):
+        counts = Counter()
+        for page_num in pages:
+            counts.update(page_signatures(parsed.page_dict(page_num, memoize)))
+        threshold = max(MIN_PAGES, math.ceil(MIN_SHARE * len(pages)))
+        return Boilerplate(signature for signature, n in counts.items() if n >= threshold)
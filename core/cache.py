@@ -0,0 +1,145 @@
+# core/cache.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+# Bump whenever extraction output changes. The version is part of every key,
+# so several versions can share one cache file; prune() drops the others.
+EXTRACTOR_VERSION = "5"
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def file_digest(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """Content-addressed SQLite store for extraction results.
+
+    Entries are keyed by (kind, extractor version, SHA-256 of the PDF bytes), so
+    an edited file simply misses and its old entry ages out. Payloads are
+    zlib-compressed compact JSON, and the store is kept under `max_bytes` by
+    evicting the least recently read entries.
+    """
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = str(path)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        parent = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(parent, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                version TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+            CREATE TABLE IF NOT EXISTS digests (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                digest TEXT NOT NULL
+            );
+        """)
+
+    def digest(self, pdf_path):
+        """SHA-256 of a file, memoized on (path, mtime, size) so warm runs skip re-reading it."""
+        path = os.path.abspath(pdf_path)
+        stat = os.stat(path)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest FROM digests WHERE path = ? AND mtime_ns = ? AND size = ?",
+                (path, stat.st_mtime_ns, stat.st_size),
+            ).fetchone()
+        if row:
+            return row[0]
+        digest = file_digest(path)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO digests (path, mtime_ns, size, digest) VALUES (?, ?, ?, ?)",
+                (path, stat.st_mtime_ns, stat.st_size, digest),
+            )
+        return digest
+
+    def _key(self, pdf_path, kind):
+        return f"{kind}:{EXTRACTOR_VERSION}:{self.digest(pdf_path)}"
+
+    def get(self, pdf_path, kind):
+        """Cached value, or None on a miss. A file that can't be read is a miss too."""
+        try:
+            key = self._key(pdf_path, kind)
+        except OSError:
+            return None
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT payload FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, pdf_path, kind, value):
+        try:
+            key = self._key(pdf_path, kind)
+        except OSError:
+            # The file vanished or became unreadable after extraction
+            return
+        payload = zlib.compress(json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, version, payload, size, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, EXTRACTOR_VERSION, payload, len(payload), time.time()),
+            )
+            self._evict()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY last_access").fetchall():
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def invalidate(self, pdf_path):
+        """Drop every cached result for the current contents of `pdf_path`."""
+        digest = self.digest(pdf_path)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries WHERE key LIKE ?", (f"%:{EXTRACTOR_VERSION}:{digest}",))
+
+    def prune(self):
+        """Drop entries written by other extractor versions; returns how many were removed.
+
+        Not done on open, since another process on a different version may
+        still be using the same cache file.
+        """
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM entries WHERE version != ?", (EXTRACTOR_VERSION,)).rowcount
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.execute("DELETE FROM digests")
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
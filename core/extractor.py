@@ -1,92 +1,229 @@
 # core/extractor.py
 
-import fitz
-from utils.text_merge import (
-    spans_can_merge_by_y,
-    spans_can_merge_by_font_and_x,
-    merge_spans
-)
-from utils.font_utils import has_similar_font_properties
-from utils.heading_rules import is_heading
-
-
-def extract_pdf_headings(pdf_path):
-    doc = fitz.open(pdf_path)
-    all_headings = []
-
-    for page_num, page in enumerate(doc, start=1):
-        blocks = page.get_text("dict")["blocks"]
-        raw_spans = []
-
-        for block_id, block in enumerate(blocks):
-            if "lines" not in block:
-                continue
-            for line in block["lines"]:
-                for span in line["spans"]:
-                    text = span.get("text", "").strip()
-                    if text:
-                        span["block_id"] = block_id
-                        raw_spans.append(span)
-
-        # Merge spans by Y-axis
-        y_merged_spans = []
-        i = 0
-        while i < len(raw_spans):
-            current = raw_spans[i]
-            while i + 1 < len(raw_spans) and spans_can_merge_by_y(current, raw_spans[i + 1]):
-                current = merge_spans(current, raw_spans[i + 1])
-                i += 1
-            y_merged_spans.append(current)
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+
+from core.boilerplate import find_boilerplate
+from core.font_profile import HEADING_MIN_SIZE, FontProfile, page_has_heading_candidates
+from core.metrics import current as current_metrics
+from core.parsed_document import ParsedDocument, open_parsed_document
+from core.spans import FONTS, Span
+from utils.font_utils import spans_share_regular_style
+from utils.heading_rules import is_heading_style, prime_sentence_checks
+
+
+# Pages handed to each worker when extract_pdf_headings runs page-sharded
+DEFAULT_SHARD_SIZE = 50
+
+
+def extract_pdf_headings(source, workers=1, shard_size=DEFAULT_SHARD_SIZE, cache=None):
+    """Extract heading candidates from every page.
+
+    With workers > 1 and more than `shard_size` pages, the document is split
+    into page ranges that are processed in a process pool. Each worker opens the
+    file itself (fitz handles can't be pickled) and the per-shard heading lists
+    are concatenated in page order, so the result matches the serial path.
+
+    Running headers, footers and page numbers found by find_boilerplate are
+    dropped before span merging on every page, and pages without a possible
+    heading are skipped. Regular-weight text only counts as a heading on size
+    alone from the document's FontProfile.heading_min_size.
+
+    With an ExtractionCache, headings are looked up by file content hash first
+    and the PDF is only opened on a miss.
+    """
+    if cache is not None:
+        pdf_path = source.path if isinstance(source, ParsedDocument) else source
+        headings = cache.get(pdf_path, "headings")
+        if headings is None:
+            headings = extract_pdf_headings(source, workers, shard_size)
+            cache.put(pdf_path, "headings", headings)
+        return headings
+
+    with open_parsed_document(source) as parsed:
+        page_count = parsed.page_count
+        if workers > 1 and page_count > shard_size:
+            # Only the sampled pages are parsed here; workers parse their own shards
+            boilerplate = find_boilerplate(parsed, memoize=False)
+            min_size = FontProfile.from_sample(parsed, memoize=False).heading_min_size()
+            return _extract_headings_sharded(parsed.path, page_count, workers, shard_size, boilerplate, min_size)
+        return extract_headings_for_pages(parsed, range(1, page_count + 1))
+
+
+def extract_headings_for_pages(source, page_nums):
+    """Heading candidates from only the given 1-based pages, in the order given."""
+    with open_parsed_document(source) as parsed:
+        boilerplate = find_boilerplate(parsed)
+        min_size = FontProfile.from_sample(parsed).heading_min_size()
+        return [
+            heading
+            for page_num in page_nums
+            for heading in _extract_page_headings(boilerplate.strip(parsed.page_dict(page_num)), page_num, min_size)
+        ]
+
+
+def extract_headings_incremental(pdf_paths, manifest, **kwargs):
+    """Headings for each path, re-extracting only files changed since the manifest was written."""
+    return manifest.refresh(
+        list(pdf_paths), "headings",
+        lambda stale: [extract_pdf_headings(path, **kwargs) for path in stale],
+    )
+
+
+def _extract_headings_sharded(pdf_path, page_count, workers, shard_size, boilerplate, min_size):
+    shards = [
+        (first_page, min(first_page + shard_size - 1, page_count))
+        for first_page in range(1, page_count + 1, shard_size)
+    ]
+    with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as pool:
+        futures = [pool.submit(_extract_heading_shard, pdf_path, first, last, boilerplate, min_size)
+                   for first, last in shards]
+        return [heading for future in futures for heading in future.result()]
+
+
+def _extract_heading_shard(pdf_path, first_page, last_page, boilerplate, min_size):
+    with ParsedDocument(pdf_path) as parsed:
+        return [
+            heading
+            for page_num in range(first_page, last_page + 1)
+            for heading in _extract_page_headings(boilerplate.strip(parsed.page_dict(page_num)), page_num, min_size)
+        ]
+
+
+def _merge_runs(spans, can_merge):
+    merged = []
+    i = 0
+    while i < len(spans):
+        current = spans[i]
+        while i + 1 < len(spans) and can_merge(current, spans[i + 1]):
+            current.absorb(spans[i + 1])
             i += 1
-
-        # Merge spans by font + X position
-        final_spans = []
-        i = 0
-        while i < len(y_merged_spans):
-            current = y_merged_spans[i]
-            while i + 1 < len(y_merged_spans) and spans_can_merge_by_font_and_x(current, y_merged_spans[i + 1]):
-                current = merge_spans(current, y_merged_spans[i + 1])
-                i += 1
-            final_spans.append(current)
-            i += 1
-
-        # Skip spans that are visually similar to surrounding text (not likely headings)
-        skip_indices = set()
-        for idx in range(len(final_spans) - 1):
-            if has_similar_font_properties(final_spans[idx], final_spans[idx + 1]):
-                skip_indices.add(idx)
-                skip_indices.add(idx + 1)
-
-        for idx, span in enumerate(final_spans):
-            if idx in skip_indices:
-                continue
-            if is_heading(span) and span.get("origin", [0])[0] <= 200:
-                heading_data = {
-                    "text": span.get("text", "").strip(),
-                    "page": page_num,
-                    "y": span.get("origin", [None, None])[1],
-                    "x": span.get("origin", [None, None])[0],
-                    "font": span.get("font"),
-                    "size": span.get("size"),
-                    "flags": span.get("flags"),
-                    "color": span.get("color"),
-                    "bbox": span.get("bbox"),
-                    "block_id": span.get("block_id"),
-                    "origin": span.get("origin")
-                }
-                all_headings.append(heading_data)
-
-    return all_headings
-
-
-def extract_pdf_content(file_path, headings):
-    doc = fitz.open(file_path)
+        merged.append(current)
+        i += 1
+    return merged
+
+
+def _extract_page_headings(blocks, page_num, min_size):
+    # Pages set entirely in regular-weight text below heading size, with no
+    # colon or leading number anywhere, cannot yield a heading
+    if not page_has_heading_candidates(blocks):
+        current_metrics().incr("pages_pruned")
+        return []
+    return _detect_headings(_merge_page_spans(blocks), page_num, min_size)
+
+
+def _merge_page_spans(blocks):
+    metrics = current_metrics()
+    with metrics.stage("span_merge"):
+        final_spans, raw_count = _merge_raw_spans(blocks)
+    metrics.incr("spans_seen", raw_count)
+    metrics.incr("spans_merged", raw_count - len(final_spans))
+    return final_spans
+
+
+def _merge_raw_spans(blocks):
+    raw_spans = []
+
+    for block_id, block in enumerate(blocks):
+        if "lines" not in block:
+            continue
+        for line in block["lines"]:
+            for span in line["spans"]:
+                text = span.get("text", "").strip()
+                if text:
+                    raw_spans.append(Span.from_dict(span, block_id))
+
+    # Merge spans by Y-axis
+    y_merged_spans = _merge_runs(raw_spans, Span.can_merge_by_y)
+
+    # Merge spans by font + X position
+    return _merge_runs(y_merged_spans, Span.can_merge_by_font_and_x), len(raw_spans)
+
+
+def _detect_headings(final_spans, page_num, min_size=HEADING_MIN_SIZE):
+    metrics = current_metrics()
+    with metrics.stage("is_heading"):
+        headings = _apply_heading_rules(final_spans, page_num, min_size)
+    metrics.incr("headings", len(headings))
+    return headings
+
+
+def _apply_heading_rules(final_spans, page_num, min_size):
+    headings = []
+
+    # Skip spans that are visually similar to surrounding text (not likely headings)
+    skip_indices = set()
+    for idx in range(len(final_spans) - 1):
+        if spans_share_regular_style(final_spans[idx], final_spans[idx + 1], FONTS):
+            skip_indices.add(idx)
+            skip_indices.add(idx + 1)
+
+    candidates = [
+        span for idx, span in enumerate(final_spans)
+        if idx not in skip_indices and span.x <= 200
+    ]
+    prime_sentence_checks((span.text, FONTS.names[span.font_id]) for span in candidates)
+
+    for span in candidates:
+        font = FONTS.names[span.font_id]
+        if is_heading_style(span.text, font, span.size, min_size):
+            heading_data = {
+                "text": span.text.strip(),
+                "page": page_num,
+                "y": span.y,
+                "x": span.x,
+                "font": font,
+                "size": span.size,
+                "flags": span.flags,
+                "color": span.color,
+                "bbox": span.bbox,
+                "block_id": span.block,
+                "origin": (span.x, span.y)
+            }
+            headings.append(heading_data)
+
+    return headings
+
+
+def _build_span_index(parsed):
+    """Read every page once into (texts, ys, order) where ys is sorted and
+    order maps each sorted position back to the span's reading-order index."""
+    boilerplate = find_boilerplate(parsed)
+    index = []
+    for page_num in range(1, parsed.page_count + 1):
+        blocks = boilerplate.strip(parsed.page_dict(page_num))
+        texts = []
+        ys = []
+        for block in blocks:
+            for line in block.get("lines", []):
+                for span in line.get("spans", []):
+                    texts.append(span["text"])
+                    ys.append(span["origin"][1])
+        order = sorted(range(len(ys)), key=ys.__getitem__)
+        index.append((texts, [ys[k] for k in order], order))
+    return index
+
+
+def _page_texts_between(page_index, y_min, y_max):
+    """Texts of a page with y_min < y < y_max, in reading order."""
+    texts, ys, order = page_index
+    if y_min == float("-inf") and y_max == float("inf"):
+        return texts
+    start = bisect_right(ys, y_min)
+    end = bisect_left(ys, y_max)
+    return [texts[k] for k in sorted(order[start:end])]
+
+
+def extract_pdf_content(source, headings):
+    with open_parsed_document(source) as parsed:
+        span_index = _build_span_index(parsed)
+        page_count = parsed.page_count
 
     # Sort headings to maintain correct order
     headings_sorted = sorted(headings, key=lambda h: (h["page"], h.get("y", 0)))
 
     # Add dummy end heading
-    dummy_end = {"page": doc.page_count, "text": "END_OF_DOCUMENT", "y": float("inf")}
+    dummy_end = {"page": page_count, "text": "END_OF_DOCUMENT", "y": float("inf")}
     headings_sorted.append(dummy_end)
 
     content_blocks = []
@@ -97,16 +234,9 @@ def extract_pdf_content(file_path, headings):
 
         content = []
         for page_num in range(current["page"], next_heading["page"] + 1):
-            page = doc.load_page(page_num - 1)
-            blocks = page.get_text("dict")["blocks"]
-            for block in blocks:
-                for line in block.get("lines", []):
-                    for span in line.get("spans", []):
-                        y = span["origin"][1]
-                        if (page_num == current["page"] and y <= current.get("y", 0)) or \
-                           (page_num == next_heading["page"] and y >= next_heading.get("y", float("inf"))):
-                            continue
-                        content.append(span["text"])
+            y_min = current.get("y", 0) if page_num == current["page"] else float("-inf")
+            y_max = next_heading.get("y", float("inf")) if page_num == next_heading["page"] else float("inf")
+            content.extend(_page_texts_between(span_index[page_num - 1], y_min, y_max))
 
         content_blocks.append({
             "heading": current["text"],
@@ -115,4 +245,4 @@ def extract_pdf_content(file_path, headings):
             "page_end": next_heading["page"]
         })
 
-    return content_blocks
\ No newline at end of file
+    return content_blocks
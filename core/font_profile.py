@@ -0,0 +1,113 @@
+# core/font_profile.py
+
+from collections import Counter
+
+from core.boilerplate import sample_pages
+
+# Below this size a regular-weight span can only pass the heading rules through
+# a leading number or a colon (see utils.heading_rules.is_heading_style)
+HEADING_MIN_SIZE = 15
+# Text this much larger than the body size can be a heading on size alone
+BODY_SIZE_MARGIN = 2.0
+
+
+def _is_bold_font(name):
+    name = name.lower()
+    return "bold" in name or "black" in name
+
+
+def could_start_heading(span):
+    """False when no merged span built from this raw span can pass is_heading_style.
+
+    Merged spans take the style of one of their raw spans and their text starts
+    and ends with raw span text, so a page where this is False for every span
+    has no headings: the heading style rules need a bold font or size >= 15,
+    and the pattern and colon rules need a leading digit or a colon.
+    """
+    text = span["text"].strip()
+    return bool(text) and (
+        span["size"] >= HEADING_MIN_SIZE or
+        _is_bold_font(span["font"]) or
+        ":" in text or
+        text[0].isdigit()
+    )
+
+
+def page_has_heading_candidates(blocks):
+    return any(
+        could_start_heading(span)
+        for block in blocks
+        for line in block.get("lines", ())
+        for span in line["spans"]
+    )
+
+
+class FontProfile:
+    """Character count per (font, size, flags) style over a whole document."""
+
+    def __init__(self):
+        self.chars = Counter()
+
+    @classmethod
+    def from_document(cls, parsed, pages=None, memoize=True):
+        """Profile of the given 1-based pages, or of every page."""
+        profile = cls()
+        for page_num in pages if pages is not None else range(1, parsed.page_count + 1):
+            profile.add_blocks(parsed.page_blocks(page_num, memoize))
+        return profile
+
+    @classmethod
+    def from_sample(cls, parsed, memoize=True):
+        """Profile of the pages find_boilerplate samples, which it has usually parsed already."""
+        return cls.from_document(parsed, sample_pages(parsed.page_count), memoize)
+
+    def add_blocks(self, blocks):
+        for block in blocks:
+            for line in block.get("lines", ()):
+                for span in line["spans"]:
+                    text = span["text"].strip()
+                    if text:
+                        self.chars[(span["font"], round(span["size"], 1), span["flags"])] += len(text)
+
+    @property
+    def body_style(self):
+        """The style carrying the most text, or None for a document without text."""
+        if not self.chars:
+            return None
+        return self.chars.most_common(1)[0][0]
+
+    @property
+    def body_size(self):
+        """The font size carrying the most text, over all fonts, or None for a document without text."""
+        sizes = Counter()
+        for (_, size, _), n in self.chars.items():
+            sizes[size] += n
+        return sizes.most_common(1)[0][0] if sizes else None
+
+    def heading_min_size(self):
+        """Size from which regular-weight text is a heading on size alone.
+
+        The body size plus BODY_SIZE_MARGIN, but never below HEADING_MIN_SIZE,
+        so ordinary documents keep the fixed 15pt rule. In a document whose
+        body is set at 15pt or more, body lines are not headings just for
+        being large; bold, numbered and colon headings are unaffected.
+        """
+        if self.body_size is None:
+            return HEADING_MIN_SIZE
+        return max(HEADING_MIN_SIZE, self.body_size + BODY_SIZE_MARGIN)
+
+    def style_ranks(self, headings):
+        """Map each (font, size) used by `headings` to its rank, 0 being the most prominent.
+
+        Headings set in the body font and size (numbered or colon run-ins) come
+        last. The rest are ordered by size, then bold before regular, then by
+        how little text the document sets in them, so a rare display style
+        ranks above a common one of the same size.
+        """
+        usage = Counter()
+        for (font, size, _), n in self.chars.items():
+            usage[(font, size)] += n
+        body = self.body_style[:2] if self.chars else None
+        styles = {(h.get("font", ""), round(h.get("size", 0), 1)) for h in headings}
+        ordered = sorted(styles, key=lambda s: (s == body, -s[1], not _is_bold_font(s[0]), usage[s]))
+        return {style: rank for rank, style in enumerate(ordered)}
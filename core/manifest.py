@@ -0,0 +1,99 @@
+# core/manifest.py
+
+import json
+import logging
+import os
+
+from core.atomic_write import atomic_write
+from core.cache import EXTRACTOR_VERSION, file_digest
+
+MANIFEST_NAME = ".extraction_manifest.json"
+
+logger = logging.getLogger(__name__)
+
+
+class Manifest:
+    """Per-collection record of each document's stat, hash and extraction results.
+
+    refresh() re-extracts only documents that were added or modified since the
+    last run and drops documents that are gone, so a nightly refresh of a large
+    collection only pays for what changed. A file whose mtime moved but whose
+    bytes did not (e.g. a re-copy) is detected by hash and reused. A manifest
+    that can't be read or parsed is logged and treated as empty.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.entries = {}
+        # Paths re-extracted by the last refresh()
+        self.stale = []
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if not isinstance(data, dict) or not isinstance(data.get("documents", {}), dict):
+                    raise ValueError("not a manifest object")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable manifest {self.path}: {e}")
+                return
+            # Results from another extractor version are not reusable
+            if data.get("extractor_version") == EXTRACTOR_VERSION:
+                self.entries = data.get("documents", {})
+
+    def lookup(self, path, kind):
+        """Stored `kind` result for path if the file is unchanged, else None."""
+        entry = self.entries.get(path)
+        if entry is None or kind not in entry or not os.path.exists(path):
+            return None
+        stat = os.stat(path)
+        if entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return entry[kind]
+        if entry["size"] == stat.st_size and entry["sha256"] == file_digest(path):
+            entry["mtime_ns"] = stat.st_mtime_ns
+            return entry[kind]
+        return None
+
+    def record(self, path, kind, value):
+        stat = os.stat(path)
+        entry = self.entries.get(path)
+        if entry is None or entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+            # The file changed, so results of other kinds are stale too
+            entry = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": file_digest(path)}
+            self.entries[path] = entry
+        entry[kind] = value
+
+    def forget(self, path):
+        self.entries.pop(path, None)
+
+    def refresh(self, paths, kind, extract, prune=True):
+        """Return `kind` results for every path, in order.
+
+        `extract` takes the list of added/modified paths and returns their
+        results in the same order. With prune=True, entries for paths that are
+        no longer listed are dropped.
+        """
+        results = {}
+        stale = []
+        for path in paths:
+            value = self.lookup(path, kind)
+            if value is None:
+                stale.append(path)
+            else:
+                results[path] = value
+        if stale:
+            for path, value in zip(stale, extract(stale)):
+                self.record(path, kind, value)
+                results[path] = value
+        if prune:
+            listed = set(paths)
+            for path in [p for p in self.entries if p not in listed]:
+                del self.entries[path]
+        self.stale = stale
+        return [results[path] for path in paths]
+
+    def save(self):
+        """Write atomically: temp file in the same directory, then rename."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with atomic_write(self.path, prefix=".manifest-") as f:
+            json.dump({"extractor_version": EXTRACTOR_VERSION, "documents": self.entries},
+                      f, separators=(",", ":"), ensure_ascii=False)
@@ -0,0 +1,140 @@
+# core/metrics.py
+
+import contextlib
+import contextvars
+import cProfile
+import json
+import os
+import re
+import time
+import tracemalloc
+
+# Stem of the per-run report. Stems derived from labels only contain
+# [A-Za-z0-9_], so no document (not even run.pdf) can overwrite it.
+RUN_REPORT_STEM = "run-summary"
+
+
+class Metrics:
+    """Stage timers and counters for one document or run."""
+
+    enabled = True
+
+    def __init__(self, label=""):
+        self.label = label
+        self.timings = {}
+        self.counters = {}
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+
+    def incr(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def merge(self, report):
+        """Fold another report (e.g. from a worker process) into this one."""
+        for name, seconds in report.get("timings", {}).items():
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+        for name, n in report.get("counters", {}).items():
+            self.incr(name, n)
+
+    def report(self):
+        return {
+            "label": self.label,
+            "timings": {name: round(seconds, 6) for name, seconds in self.timings.items()},
+            "counters": dict(self.counters),
+        }
+
+    def to_prometheus(self, prefix="docintel"):
+        """Render in the Prometheus textfile-collector format."""
+        label = self.label.replace("\\", "\\\\").replace('"', '\\"')
+        lines = []
+        for name, seconds in sorted(self.timings.items()):
+            lines.append(f'{prefix}_stage_seconds{{document="{label}",stage="{name}"}} {seconds:.6f}')
+        for name, n in sorted(self.counters.items()):
+            lines.append(f'{prefix}_{_metric_name(name)}_total{{document="{label}"}} {n}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, output_dir, fmt="json", stem=None):
+        """Write the report to <output_dir>/<stem>.json or .prom and return the path.
+
+        stem defaults to the label's file name without extension.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        if stem is None:
+            stem = _metric_name(os.path.splitext(os.path.basename(self.label))[0] or "run")
+        if fmt == "prom":
+            path = os.path.join(output_dir, f"{stem}.prom")
+            content = self.to_prometheus()
+        else:
+            path = os.path.join(output_dir, f"{stem}.json")
+            content = json.dumps(self.report(), indent=2)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+
+class _NullMetrics:
+    """Stand-in used when instrumentation is off; every call is a no-op."""
+
+    enabled = False
+    _stage = contextlib.nullcontext()
+
+    def stage(self, name):
+        return self._stage
+
+    def incr(self, name, n=1):
+        pass
+
+
+NULL_METRICS = _NullMetrics()
+_current = contextvars.ContextVar("metrics", default=NULL_METRICS)
+
+
+def current():
+    """The Metrics collecting in this context, or the no-op NULL_METRICS."""
+    return _current.get()
+
+
+@contextlib.contextmanager
+def collect(label=""):
+    """Collect metrics for the enclosed block and yield the Metrics object."""
+    metrics = Metrics(label)
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+@contextlib.contextmanager
+def profiled(output_prefix, top=25):
+    """Run the enclosed block under cProfile and tracemalloc.
+
+    Writes <output_prefix>.pstats (load with pstats or snakeviz) and
+    <output_prefix>.mem.txt with peak memory and the top allocation sites.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(output_prefix)), exist_ok=True)
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        profiler.dump_stats(f"{output_prefix}.pstats")
+        with open(f"{output_prefix}.mem.txt", 'w', encoding='utf-8') as f:
+            f.write(f"peak_bytes {peak}\n")
+            for stat in snapshot.statistics("lineno")[:top]:
+                f.write(f"{stat}\n")
+
+
+def _metric_name(name):
+    return re.sub(r"[^A-Za-z0-9_]", "_", name)
@@ -0,0 +1,168 @@
+# core/outline.py
+
+import json
+
+# Define font strength hierarchy (modify as needed)
+FONT_STRENGTH = {
+    "Arial-Black": 5,
+    "Arial-BoldMT": 4,
+    "Arial-BoldItalicMT": 3,
+    "Arial-ItalicMT": 2,
+    "ArialMT": 1
+}
+
+
+def level_headings(headings, font_strength=FONT_STRENGTH):
+    """
+    Assign H-levels to extracted headings.
+    Pure: the input dicts are left untouched and the returned list holds copies
+    with a 'level' key. Front-page headings are dropped when the front page
+    looks like a title page.
+    """
+    process_front_page = should_include_front_page(headings)
+
+    leveled = []
+    stack = []
+
+    for heading in headings:
+
+        if not process_front_page and heading.get('page', 0) == 1:
+            continue
+        heading = dict(heading)
+        leveled.append(heading)
+        if heading.get('size', 0) > 15:
+            heading['level'] = 1
+            stack = [heading]
+            continue
+
+        while stack:
+            top = stack[-1]
+            top_size = top.get('size', 0)
+            curr_size = heading.get('size', 0)
+
+            if top_size > curr_size:
+                heading['level'] = top.get('level', 0) + 1
+                break
+            elif top_size == curr_size:
+                top_str = font_strength.get(top.get('font'), 0)
+                curr_str = font_strength.get(heading.get('font'), 0)
+
+                if top_str > curr_str:
+                    heading['level'] = top.get('level', 0) + 1
+                    break
+                elif top_str == curr_str:
+                    if heading.get('y', 0) < top.get('y', 0):
+                        stack.pop()
+                        continue
+                    else:
+                        heading['level'] = top.get('level', 1)
+                        stack.pop()
+                        break
+                else:
+                    stack.pop()
+            else:
+                stack.pop()
+
+        if not stack:
+            heading['level'] = 1
+
+        stack.append(heading)
+
+    return leveled
+
+
+# Deepest level assigned by profile-based leveling; rarer styles share it
+MAX_PROFILE_LEVEL = 6
+
+
+def level_headings_by_profile(headings, profile):
+    """
+    Assign H-levels by rank among the document's own heading styles
+    (see FontProfile.style_ranks) instead of the fixed FONT_STRENGTH table and
+    size thresholds. Same front-page handling and copy semantics as level_headings.
+    """
+    if not should_include_front_page(headings):
+        headings = [h for h in headings if h.get('page', 0) != 1]
+    ranks = profile.style_ranks(headings)
+    leveled = []
+    for heading in headings:
+        heading = dict(heading)
+        rank = ranks[(heading.get('font', ''), round(heading.get('size', 0), 1))]
+        heading['level'] = min(rank + 1, MAX_PROFILE_LEVEL)
+        leveled.append(heading)
+    return leveled
+
+
+def should_include_front_page(headings):
+    """
+    Determines if front page should be included in structure analysis based on:
+    1. Number of headings on front page (page 1)
+    2. Positioning of headings
+    3. Total page count
+
+    Returns: True if front page should be included, False otherwise
+    """
+    if not headings:
+        return False
+
+    # Count total pages by finding max page number
+    total_pages = max(h.get('page', 0) for h in headings)
+
+    # Get all front page (page 1) headings
+    front_page_headings = [h for h in headings if h.get('page') == 1]
+
+    # Case 1: Single-page document - always include
+    if total_pages == 1:
+        return True
+
+    # Case 2: Front page has insufficient content (1-2 headings)
+    if len(front_page_headings) <= 2:
+        return False
+
+    # Case 3: Check if front page headings are positioned like titles
+    y_positions = [h.get('y', 0) for h in front_page_headings]
+    avg_y = sum(y_positions) / len(y_positions) if y_positions else 0
+
+    # If most headings are in top half of page, likely a title page
+    if avg_y < 300:  # Adjust threshold based on typical page height
+        return False
+
+    # Default case: Include front page
+    return True
+
+
+def outline_entry(heading):
+    return {
+        "level": f"H{heading['level']}",
+        "text": heading.get('text', '').strip(),
+        "page": heading.get('page', 1) - 1  # Converting to 0-based index
+    }
+
+
+def render_outline(leveled, fmt, out):
+    """Write leveled headings to a text stream as a text tree, a JSON array or JSONL."""
+    if fmt == "text":
+        out.write("\nDocument Structure:\n\n")
+        for heading in leveled:
+            indent = '    ' * (heading['level'] - 1)
+            out.write(f"{indent}L{heading['level']}: {heading.get('text', '')}\n")
+            out.write(f"{indent}   Page: {heading.get('page', '?')}, Size: {heading.get('size', '?')}\n")
+            out.write(f"{indent}   Font: {heading.get('font', '?')}\n")
+            out.write("-" * 60 + "\n")
+    elif fmt == "json":
+        json.dump([outline_entry(h) for h in leveled], out, ensure_ascii=False)
+        out.write("\n")
+    elif fmt == "jsonl":
+        for heading in leveled:
+            out.write(json.dumps(outline_entry(heading), ensure_ascii=False) + "\n")
+    else:
+        raise ValueError(f"Unknown outline format: {fmt!r}")
+
+
+def write_outline_json(out, title, leveled):
+    """Stream {"title": ..., "outline": [...]} to `out` one entry per line,
+    without building the whole document in memory first."""
+    out.write('{"title": ' + json.dumps(title, ensure_ascii=False) + ', "outline": [')
+    for i, heading in enumerate(leveled):
+        out.write(("," if i else "") + "\n  " + json.dumps(outline_entry(heading), ensure_ascii=False))
+    out.write("\n]}\n")
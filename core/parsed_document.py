@@ -0,0 +1,82 @@
+# core/parsed_document.py
+
+from contextlib import contextmanager
+
+import fitz
+
+from core.metrics import current as current_metrics
+from core.text_options import SPANS
+
+
+class ParsedDocument:
+    """An open PDF whose per-page text dicts are parsed on first use and memoized,
+    so title, heading and content extraction all share a single parse.
+    """
+
+    def __init__(self, pdf_path, data=None):
+        """With `data`, the PDF is opened from those bytes (already read by the
+        caller) and pdf_path only names it."""
+        self.path = str(pdf_path)
+        self._doc = fitz.open(stream=data, filetype="pdf") if data is not None else fitz.open(pdf_path)
+        self._page_dicts = {}
+
+    @property
+    def page_count(self):
+        return self._doc.page_count
+
+    def page_dict(self, page_num, memoize=True):
+        """`get_text("dict")` output for a 1-based page number, shared by all span consumers."""
+        result = self._page_dicts.get(page_num)
+        if result is None:
+            metrics = current_metrics()
+            with metrics.stage("get_text"):
+                result = SPANS.extract(self._doc.load_page(page_num - 1))
+            metrics.incr("pages_parsed")
+            if memoize:
+                self._page_dicts[page_num] = result
+        return result
+
+    def page_blocks(self, page_num, memoize=True):
+        return self.page_dict(page_num, memoize)["blocks"]
+
+    def iter_pages(self, memoize=True):
+        """Yield (page_num, blocks) for every page, 1-based.
+
+        memoize=False streams pages without keeping them, for single-consumer
+        passes over large documents.
+        """
+        for page_num in range(1, self.page_count + 1):
+            yield page_num, self.page_blocks(page_num, memoize)
+
+    def toc(self):
+        """The bookmark tree as get_toc(simple=False) rows: [level, title, page, dest]."""
+        return self._doc.get_toc(simple=False)
+
+    def close(self):
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+        self._page_dicts.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+@contextmanager
+def open_parsed_document(source):
+    """Yield a ParsedDocument for a path, or pass an existing one through.
+
+    Only documents opened here are closed here; a caller that hands in its own
+    ParsedDocument keeps ownership of it.
+    """
+    if isinstance(source, ParsedDocument):
+        yield source
+        return
+    parsed = ParsedDocument(source)
+    try:
+        yield parsed
+    finally:
+        parsed.close()
@@ -0,0 +1,229 @@
+# core/section_index.py
+
+import heapq
+import math
+import re
+from collections import defaultdict
+
+from core.metrics import current as current_metrics
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+TITLE_FIELD = 1
+BODY_FIELD = 2
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def section_terms(section):
+    """Term counts of a section's title and body fields, as SectionIndex indexes them."""
+    title_terms = defaultdict(int)
+    for term in tokenize(section.get("section_title", "")):
+        title_terms[term] += 1
+    body_terms = defaultdict(int)
+    for term in tokenize(section.get("content", "")):
+        body_terms[term] += 1
+    return title_terms, body_terms
+
+
+def length_prior(content):
+    """Bonus for comprehensive sections, as in calculate_section_relevance."""
+    word_count = len(content.split())
+    return min(2.0, word_count / 100) if word_count > 50 else 0.0
+
+
+class SectionIndex:
+    """Inverted index over sections with BM25F scoring.
+
+    Each section is tokenized once into a title field and a body field. Postings
+    map a term to {section_id: (title_tf, body_tf)}; the field flags of a
+    posting are implied by which counts are non-zero. Sections can be added and
+    removed per document so a warm index can be updated incrementally.
+    """
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.sections = {}
+        self.postings = defaultdict(dict)
+        self._lengths = {}
+        self._priors = {}
+        self._documents = defaultdict(list)
+        self._next_id = 0
+        self._total_length = 0.0
+        self._prior_order = None
+
+    def __len__(self):
+        return len(self.sections)
+
+    def add_sections(self, sections):
+        for section in sections:
+            self.add_section(section)
+
+    def add_section(self, section):
+        section_id = self._next_id
+        self._next_id += 1
+
+        title_terms, body_terms = section_terms(section)
+        for term in title_terms.keys() | body_terms.keys():
+            self.postings[term][section_id] = (title_terms.get(term, 0), body_terms.get(term, 0))
+
+        length = sum(title_terms.values()) + sum(body_terms.values())
+        self.sections[section_id] = section
+        self._lengths[section_id] = length
+        self._priors[section_id] = length_prior(section.get("content", ""))
+        self._documents[section.get("document", "unknown")].append(section_id)
+        self._total_length += length
+        self._prior_order = None
+        return section_id
+
+    def remove_document(self, document):
+        """Drop every section that was indexed for `document`."""
+        for section_id in self._documents.pop(document, []):
+            section = self.sections.pop(section_id)
+            terms = set(tokenize(section.get("section_title", ""))) | set(tokenize(section.get("content", "")))
+            for term in terms:
+                postings = self.postings.get(term)
+                if postings is None:
+                    continue
+                postings.pop(section_id, None)
+                if not postings:
+                    del self.postings[term]
+            self._total_length -= self._lengths.pop(section_id)
+            del self._priors[section_id]
+        self._prior_order = None
+
+    def idf(self, term):
+        n = len(self.sections)
+        df = len(self.postings.get(term, ()))
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def top_k(self, query, k):
+        """Return the k best (score, section) pairs for a query.
+
+        `query` maps term -> (weight, title_boost): the term's query weight and
+        how much a title occurrence counts relative to a body occurrence.
+
+        Only sections reached through the query's postings are scored. Every
+        other section scores its static length prior alone, so the best of those
+        come from an ordering computed once per index state.
+        """
+        if not self.sections or k <= 0:
+            return []
+        avg_length = self._total_length / len(self.sections) or 1.0
+        scores = {}
+        for term, (weight, title_boost) in query.items():
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf(term)
+            for section_id, (title_tf, body_tf) in postings.items():
+                tf = (title_boost * title_tf + body_tf) / (1 - self.b + self.b * self._lengths[section_id] / avg_length)
+                score = weight * idf * tf * (self.k1 + 1) / (self.k1 + tf)
+                scores[section_id] = scores.get(section_id, 0.0) + score
+
+        candidates = [(score + self._priors[section_id], section_id) for section_id, score in scores.items()]
+        filled = 0
+        for section_id in self._priors_descending():
+            if filled == k:
+                break
+            if section_id not in scores:
+                candidates.append((self._priors[section_id], section_id))
+                filled += 1
+
+        current_metrics().incr("ranking_candidates", len(candidates))
+        # Ties keep insertion order, matching the previous stable sort
+        best = heapq.nsmallest(k, candidates, key=lambda c: (-c[0], c[1]))
+        return [(round(score, 2), self.sections[section_id]) for score, section_id in best]
+
+    def _priors_descending(self):
+        if self._prior_order is None:
+            self._prior_order = sorted(self._priors, key=lambda section_id: (-self._priors[section_id], section_id))
+        return self._prior_order
+
+
+class StreamStats:
+    """Corpus statistics for scoring a section stream exactly as SectionIndex does.
+
+    BM25F needs the section count, the average length and each query term's
+    document frequency before any section can be scored, so a stream is read
+    twice: add() every section in a first pass, then score() each one in a
+    second. Only the query terms' frequencies are kept, so memory does not
+    grow with the corpus.
+    """
+
+    def __init__(self, query, k1=1.2, b=0.75):
+        self.query = query
+        self.k1 = k1
+        self.b = b
+        self.sections = 0
+        self.total_length = 0.0
+        self.df = dict.fromkeys(query, 0)
+
+    def add(self, section):
+        title_terms, body_terms = section_terms(section)
+        self.sections += 1
+        self.total_length += sum(title_terms.values()) + sum(body_terms.values())
+        for term in self.df:
+            if term in title_terms or term in body_terms:
+                self.df[term] += 1
+
+    def merge(self, other):
+        """Fold in the statistics another StreamStats gathered for the same query."""
+        self.sections += other.sections
+        self.total_length += other.total_length
+        for term, df in other.df.items():
+            self.df[term] += df
+
+    def score(self, section):
+        """The unrounded score SectionIndex.top_k ranks this section by."""
+        title_terms, body_terms = section_terms(section)
+        length = sum(title_terms.values()) + sum(body_terms.values())
+        avg_length = (self.total_length / self.sections if self.sections else 0.0) or 1.0
+        score = 0.0
+        for term, (weight, title_boost) in self.query.items():
+            title_tf = title_terms.get(term, 0)
+            body_tf = body_terms.get(term, 0)
+            if not (title_tf or body_tf):
+                continue
+            df = self.df[term]
+            idf = math.log(1 + (self.sections - df + 0.5) / (df + 0.5))
+            tf = (title_boost * title_tf + body_tf) / (1 - self.b + self.b * length / avg_length)
+            score += weight * idf * tf * (self.k1 + 1) / (self.k1 + tf)
+        return score + length_prior(section.get("content", ""))
+
+
+class BoundedTopK:
+    """Keep the k highest-scoring items pushed so far; earlier items win ties.
+
+    Memory is bounded by k regardless of how many items stream through.
+    """
+
+    def __init__(self, k):
+        self.k = k
+        self._heap = []
+        self._seq = 0
+
+    def push(self, score, item):
+        # (score, -seq) is unique, so items themselves are never compared
+        entry = (score, -self._seq, item)
+        self._seq += 1
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def merge(self, other):
+        """Push another BoundedTopK's items after everything pushed here so far.
+
+        Its items keep their relative push order, so merging per-part top-k
+        lists in part order gives the same result as pushing every item here.
+        """
+        for score, _, item in sorted(other._heap, key=lambda e: -e[1]):
+            self.push(score, item)
+
+    def items(self):
+        """(score, item) pairs, best first."""
+        return [(score, item) for score, _, item in sorted(self._heap, key=lambda e: (-e[0], -e[1]))]
@@ -0,0 +1,92 @@
+# core/sentence_index.py
+
+import heapq
+import re
+
+from core.section_index import tokenize
+
+# A sentence runs up to and including its terminal punctuation
+SENTENCE_PATTERN = re.compile(r"[^.!?]+[.!?]*")
+# Sentences per subsection window
+WINDOW = 3
+# Windows shorter than this many characters are not worth showing
+MIN_WINDOW_CHARS = 50
+
+
+def segment(content):
+    """Sentence index for a section's content: [start, end] character offsets per sentence.
+
+    Subsection extraction never re-splits the text, and only the few
+    top-ranked sections it looks at are tokenized. Offsets alone keep the
+    index small in the cache, the manifest and process-pool results; plain
+    lists keep sections JSON-serializable.
+    """
+    sentences = []
+    for match in SENTENCE_PATTERN.finditer(content):
+        start, end = match.span()
+        text = match.group()
+        stripped = text.strip()
+        if not stripped.strip(".!?"):
+            continue
+        start += len(text) - len(text.lstrip())
+        end -= len(text) - len(text.rstrip())
+        sentences.append([start, end])
+    return sentences
+
+
+def window_score(sentence_terms, first, last, query):
+    """Sum of query weights over the distinct terms in sentence_terms[first:last]."""
+    terms = set()
+    for tokens in sentence_terms[first:last]:
+        terms.update(tokens)
+    return sum(query[term][0] for term in terms if term in query)
+
+
+def best_windows(indexed_sections, query, limit, window=WINDOW, min_chars=MIN_WINDOW_CHARS):
+    """Pick up to `limit` non-overlapping sentence windows, best first.
+
+    indexed_sections is a sequence of (content, sentences) in rank order.
+    Every run of `window` consecutive sentences is scored against the query.
+    Ties go to the higher-ranked section, then the earlier window. Once the
+    windows sharing a term with the query run out, the remaining slots are
+    filled with the other windows in reading order, so a query matching
+    nothing still gets subsections. Yields (section position, window text).
+    """
+    heap = []
+    unmatched = []
+    for position, (content, sentences) in enumerate(indexed_sections):
+        count = len(sentences)
+        terms = None
+        for first in range(max(1, count - window + 1)):
+            last = min(first + window, count)
+            if first == last:
+                continue
+            if sentences[last - 1][1] - sentences[first][0] <= min_chars:
+                continue
+            if terms is None:
+                terms = [set(tokenize(content[start:end])) for start, end in sentences]
+            score = window_score(terms, first, last, query)
+            if score > 0:
+                heap.append((-score, position, first, last))
+            else:
+                unmatched.append((position, first, last))
+    heapq.heapify(heap)
+
+    def ranked():
+        while heap:
+            _, position, first, last = heapq.heappop(heap)
+            yield position, first, last
+        yield from unmatched
+
+    taken = {}
+    found = 0
+    for position, first, last in ranked():
+        if found >= limit:
+            break
+        used = taken.setdefault(position, [])
+        if any(first < u_last and u_first < last for u_first, u_last in used):
+            continue
+        used.append((first, last))
+        content, sentences = indexed_sections[position]
+        found += 1
+        yield position, content[sentences[first][0]:sentences[last - 1][1]]
@@ -0,0 +1,49 @@
+# core/span_classifier.py
+
+import re
+
+# Heading patterns (anchored, as with re.match) folded into one alternation:
+# "Title Case Words", "1. Numbered", "IV. Roman numbered", "ACRONYM..."
+HEADING_PATTERN = re.compile(r"[A-Z][A-Za-z\s]+$|\d+\.?\s+[A-Z]|[IVX]+\.?\s+[A-Z]|[A-Z]{2,}")
+# Sentence punctuation that marks running text rather than a heading
+CONTENT_PATTERN = re.compile(r"\.\s+[A-Z]|,\s+|;\s+")
+LEVEL1_PATTERN = re.compile(r"\d+\.\s+[A-Z]")
+LEVEL2_PATTERN = re.compile(r"[A-Z]\.\s+[A-Z]")
+
+
+def heading_level(text, font_size, is_bold):
+    if font_size > 16 or text.isupper() or LEVEL1_PATTERN.match(text):
+        return 1
+    elif font_size > 14 or is_bold or LEVEL2_PATTERN.match(text):
+        return 2
+    else:
+        return 3
+
+
+def classify_spans(texts, sizes, bolds):
+    """Classify a page's spans in one call.
+
+    Takes parallel sequences of stripped text, font size and bold flag and
+    returns parallel (types, levels) lists: type is "H1".."H3", "content", or
+    None for spans too short to keep; level is 0 for non-headings.
+    """
+    heading_match = HEADING_PATTERN.match
+    content_search = CONTENT_PATTERN.search
+    types = []
+    levels = []
+    for text, font_size, is_bold in zip(texts, sizes, bolds):
+        if len(text) < 5 or text.isdigit():
+            types.append(None)
+            levels.append(0)
+            continue
+
+        is_likely_heading = (is_bold or font_size > 12 or heading_match(text) is not None) \
+            and content_search(text) is None
+        if is_likely_heading:
+            level = heading_level(text, font_size, is_bold)
+            types.append(f"H{level}")
+            levels.append(level)
+        else:
+            types.append("content")
+            levels.append(0)
+    return types, levels
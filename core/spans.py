@@ -0,0 +1,83 @@
+# core/spans.py
+
+
+class FontTable:
+    """Interns font names to small ints and precomputes per-font style flags."""
+
+    def __init__(self):
+        self.names = []
+        self.bold = []
+        self._ids = {}
+
+    def intern(self, name):
+        font_id = self._ids.get(name)
+        if font_id is None:
+            font_id = len(self.names)
+            self._ids[name] = font_id
+            self.names.append(name)
+            lowered = name.lower()
+            self.bold.append("bold" in lowered or "black" in lowered)
+        return font_id
+
+
+# Process-wide table; font ids never leave the process that assigned them
+FONTS = FontTable()
+
+
+class Span:
+    """Compact stand-in for a PyMuPDF span dict in the heading extractor.
+
+    Merging appends text parts and joins them once when `text` is first read,
+    instead of allocating a new dict and string for every pairwise merge. As
+    with utils.text_merge.merge_spans, a merged span takes its style and origin
+    from the last span absorbed and no longer carries flags or bbox.
+    """
+
+    __slots__ = ("parts", "font_id", "size", "color", "x", "y", "block", "flags", "bbox", "_text")
+
+    def __init__(self, text, font_id, size, color, x, y, block, flags, bbox):
+        self.parts = [text]
+        self.font_id = font_id
+        self.size = size
+        self.color = color
+        self.x = x
+        self.y = y
+        self.block = block
+        self.flags = flags
+        self.bbox = bbox
+        self._text = text
+
+    @classmethod
+    def from_dict(cls, span, block, fonts=FONTS):
+        origin = span["origin"]
+        return cls(span["text"], fonts.intern(span["font"]), span["size"], span["color"],
+                   origin[0], origin[1], block, span.get("flags"), span.get("bbox"))
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = " ".join(self.parts)
+        return self._text
+
+    def can_merge_by_y(self, other, y_tolerance=1.0):
+        return abs(self.y - other.y) < y_tolerance and self.block == other.block
+
+    def can_merge_by_font_and_x(self, other):
+        return (
+            self.font_id == other.font_id and
+            self.size == other.size and
+            self.color == other.color and
+            self.block == other.block
+        )
+
+    def absorb(self, other):
+        self.parts.extend(other.parts)
+        self.font_id = other.font_id
+        self.size = other.size
+        self.color = other.color
+        self.x = other.x
+        self.y = other.y
+        self.block = other.block
+        self.flags = None
+        self.bbox = None
+        self._text = None
@@ -0,0 +1,24 @@
+# core/text_options.py
+
+from typing import NamedTuple
+
+import fitz
+
+# get_text("dict") defaults to TEXTFLAGS_DICT, which also decodes every image
+# into an image block. No extractor here reads image blocks, so span
+# consumers drop TEXT_PRESERVE_IMAGES. Ligatures and whitespace stay
+# preserved because they change the span text that the rules and ranking see.
+SPAN_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+
+class TextOptions(NamedTuple):
+    """The get_text("dict") flags a consumer extracts pages with."""
+    flags: int = SPAN_FLAGS
+
+    def extract(self, page):
+        return page.get_text("dict", flags=self.flags)
+
+
+# Span dicts shared by title, heading, content and section extraction; one
+# memoized parse per page serves all of them.
+SPANS = TextOptions()
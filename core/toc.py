@@ -0,0 +1,66 @@
+# core/toc.py
+
+# Deepest bookmark level kept in the outline (H1-H3)
+MAX_LEVEL = 3
+# A bookmark tree needs this many usable entries to be trusted
+MIN_ENTRIES = 2
+# Runs of more than this many pages without a bookmark may be left to the
+# heuristic extractor (see uncovered_pages)
+MAX_GAP = 10
+
+
+def toc_headings(parsed):
+    """Leveled headings from the document's bookmark tree, or None if it has no plausible one.
+
+    Entries look like level_headings output ('level', 'text', 'page', 'y'),
+    so the outline writers take them unchanged. Bookmarks deeper than
+    MAX_LEVEL or without a destination page are skipped.
+    """
+    page_count = parsed.page_count
+    headings = []
+    for level, title, page, dest in parsed.toc():
+        title = " ".join(title.split())
+        if level > MAX_LEVEL or not title or not 1 <= page <= page_count:
+            continue
+        # "to" is the destination's top edge in the top-left page coordinates span
+        # origins use (a raw /XYZ 72 700 on a 792pt page reads back as y=92), so
+        # it sorts just above the heading's own baseline
+        to = dest.get("to") if isinstance(dest, dict) else None
+        headings.append({
+            "text": title,
+            "page": page,
+            "y": to.y if to is not None else 0,
+            "level": level,
+            "source": "toc",
+        })
+    return headings if is_plausible(headings) else None
+
+
+def is_plausible(headings):
+    """True for a bookmark tree that can stand in for the extracted outline:
+    enough entries, starting at level 1, never skipping a level on the way
+    down, and pointing at pages in reading order."""
+    if len(headings) < MIN_ENTRIES or headings[0]["level"] != 1:
+        return False
+    for previous, heading in zip(headings, headings[1:]):
+        if heading["level"] > previous["level"] + 1 or heading["page"] < previous["page"]:
+            return False
+    return True
+
+
+def uncovered_pages(headings, page_count, max_gap=MAX_GAP):
+    """Pages the heuristic extractor should fill in around a bookmark tree.
+
+    A run of more than max_gap pages before the first bookmark is front
+    matter the tree doesn't describe. Other long runs usually belong to a
+    long chapter with a single bookmark, so they are only filled when the
+    tree is sparse: bookmarked pages are on average more than max_gap apart.
+    """
+    pages = sorted({h["page"] for h in headings})
+    bounds = [0] + pages + [page_count + 1]
+    sparse = len(pages) * max_gap < page_count
+    uncovered = []
+    for start, end in zip(bounds, bounds[1:]):
+        if end - start - 1 > max_gap and (start == 0 or sparse):
+            uncovered.extend(range(start + 1, end))
+    return uncovered
@@ -0,0 +1,202 @@
+# core/vector_scoring.py
+#
+# Needs numpy and scipy; imported lazily by GenericDocumentIntelligence.rank_many
+# so the rest of the pipeline runs without them.
+
+from bisect import bisect_right
+
+import numpy as np
+from scipy import sparse
+
+from core.metrics import current as current_metrics
+from core.section_index import length_prior, tokenize
+
+MODES = ("bm25", "compat")
+
+# compat: (weight when the keyword occurs anywhere, extra weight when it occurs
+# in the title) per keyword group, as in calculate_section_relevance
+COMPAT_WEIGHTS = {
+    "persona_keywords": (2.0, 1.5),
+    "job_keywords": (3.0, 2.0),
+    "numbers": (1.5, 0.0),
+    "time_periods": (1.0, 0.0),
+}
+
+
+def _containment_matrix(texts, terms):
+    """Sparse 0/1 matrix with [i, j] = 1 when terms[j] is a substring of texts[i]."""
+    joined = "\x00".join(texts)
+    starts = []
+    pos = 0
+    for text in texts:
+        starts.append(pos)
+        pos += len(text) + 1
+    rows, cols = [], []
+    for j, term in enumerate(terms):
+        hit = joined.find(term)
+        while hit != -1:
+            i = bisect_right(starts, hit) - 1
+            rows.append(i)
+            cols.append(j)
+            # One hit per text is enough; resume at the next text
+            if i + 1 == len(starts):
+                break
+            hit = joined.find(term, starts[i + 1])
+    data = np.ones(len(rows))
+    return sparse.csr_matrix((data, (rows, cols)), shape=(len(texts), len(terms)))
+
+
+def _top_k_rows(scores, k):
+    """Best k column indices per row of a dense score matrix, best first;
+    ties go to the lower index, as with a stable sort."""
+    n = scores.shape[1]
+    if k >= n:
+        return [np.lexsort((np.arange(n), -row)) for row in scores]
+    results = []
+    for row in scores:
+        # Everything scoring at least the k-th best, so boundary ties are all seen
+        threshold = row[np.argpartition(-row, k - 1)[k - 1]]
+        candidates = np.flatnonzero(row >= threshold)
+        order = np.lexsort((candidates, -row[candidates]))
+        results.append(candidates[order[:k]])
+    return results
+
+
+class VectorScorer:
+    """Scores a batch of queries against one fixed set of sections at once.
+
+    Sections are turned into a sparse section x term matrix once; a batch of
+    queries becomes a sparse query x term matrix and every score comes out of
+    one sparse product, with the per-query top k picked by argpartition.
+
+    mode="bm25" takes SectionIndex-style queries ({term: (weight, title_boost)})
+    and scores title and body tokens in separate columns, each with BM25
+    saturation and idf, so a query's title boost is a column weight. It
+    differs from SectionIndex's BM25F only in saturating the fields
+    separately.
+
+    mode="compat" takes extract_keywords_from_context dicts and reproduces
+    calculate_section_relevance exactly: keywords match as substrings of the
+    lowercased title and "title content" text. Columns are added for new
+    keywords as queries arrive, so repeated personas share the text scans.
+    """
+
+    def __init__(self, sections, mode="bm25", k1=1.2, b=0.75):
+        if mode not in MODES:
+            raise ValueError(f"Unknown scoring mode {mode!r}; expected one of {MODES}")
+        self.mode = mode
+        self.sections = list(sections)
+        titles = [s.get("section_title", "") for s in self.sections]
+        contents = [s.get("content", "") for s in self.sections]
+        self._priors = np.array([length_prior(c) for c in contents], dtype=float)
+
+        if mode == "compat":
+            self._titles = [t.lower() for t in titles]
+            self._combined = [f"{t} {c}".lower() for t, c in zip(titles, contents)]
+            self._vocab = {}
+            self._combined_matrix = sparse.csc_matrix((len(self.sections), 0))
+            self._title_matrix = sparse.csc_matrix((len(self.sections), 0))
+        else:
+            self._build_bm25(titles, contents, k1, b)
+
+    def __len__(self):
+        return len(self.sections)
+
+    def _build_bm25(self, titles, contents, k1, b):
+        self._vocab = {}
+        rows, cols, title_tf, body_tf = [], [], [], []
+        lengths = []
+        for i, (title, content) in enumerate(zip(titles, contents)):
+            counts = {}
+            for field, text in ((0, title), (1, content)):
+                for term in tokenize(text):
+                    j = self._vocab.setdefault(term, len(self._vocab))
+                    tf = counts.setdefault(j, [0, 0])
+                    tf[field] += 1
+            for j, (t, c) in counts.items():
+                rows.append(i)
+                cols.append(j)
+                title_tf.append(t)
+                body_tf.append(c)
+            lengths.append(sum(t + c for t, c in counts.values()))
+
+        n = len(self.sections)
+        shape = (n, len(self._vocab))
+        rows = np.array(rows, dtype=np.int64)
+        cols = np.array(cols, dtype=np.int64)
+        df = np.bincount(cols, minlength=len(self._vocab))
+        idf = np.log(1 + (n - df + 0.5) / (df + 0.5))
+
+        lengths = np.array(lengths, dtype=float)
+        avg_length = lengths.mean() if n and lengths.mean() else 1.0
+        norm = k1 * (1 - b + b * lengths / avg_length)
+
+        def saturated(tf):
+            tf = np.array(tf, dtype=float)
+            return idf[cols] * tf * (k1 + 1) / (tf + norm[rows])
+
+        title_matrix = sparse.csr_matrix((saturated(title_tf), (rows, cols)), shape=shape)
+        body_matrix = sparse.csr_matrix((saturated(body_tf), (rows, cols)), shape=shape)
+        title_matrix.eliminate_zeros()
+        body_matrix.eliminate_zeros()
+        self._matrix = sparse.hstack([title_matrix, body_matrix], format="csr")
+
+    def _ensure_terms(self, terms):
+        new_terms = [t for t in dict.fromkeys(terms) if t not in self._vocab]
+        if not new_terms:
+            return
+        for term in new_terms:
+            self._vocab[term] = len(self._vocab)
+        self._combined_matrix = sparse.hstack(
+            [self._combined_matrix, _containment_matrix(self._combined, new_terms)], format="csc")
+        self._title_matrix = sparse.hstack(
+            [self._title_matrix, _containment_matrix(self._titles, new_terms)], format="csc")
+
+    def _compat_scores(self, queries):
+        self._ensure_terms(kw for keywords in queries for group in COMPAT_WEIGHTS
+                           for kw in keywords.get(group, []))
+        shape = (len(queries), len(self._vocab))
+        combined_q = sparse.dok_matrix(shape)
+        title_q = sparse.dok_matrix(shape)
+        for q, keywords in enumerate(queries):
+            for group, (weight, title_weight) in COMPAT_WEIGHTS.items():
+                # Repeated keywords count once per repetition, as in the loop
+                for kw in keywords.get(group, []):
+                    j = self._vocab[kw]
+                    combined_q[q, j] += weight
+                    if title_weight:
+                        title_q[q, j] += title_weight
+        scores = self._combined_matrix @ combined_q.T.tocsc() + self._title_matrix @ title_q.T.tocsc()
+        return scores.T.toarray() + self._priors
+
+    def _bm25_scores(self, queries):
+        width = len(self._vocab)
+        rows, cols, data = [], [], []
+        for q, query in enumerate(queries):
+            for term, (weight, title_boost) in query.items():
+                j = self._vocab.get(term)
+                if j is None:
+                    continue
+                rows += [q, q]
+                cols += [j, width + j]
+                data += [weight * title_boost, weight]
+        query_matrix = sparse.csr_matrix((data, (rows, cols)), shape=(len(queries), 2 * width))
+        return (self._matrix @ query_matrix.T).T.toarray() + self._priors
+
+    def top_k(self, queries, k):
+        """For each query, the k best (score, section) pairs, best first."""
+        if not queries:
+            return []
+        if not self.sections or k <= 0:
+            return [[] for _ in queries]
+        metrics = current_metrics()
+        with metrics.stage("vector_scoring"):
+            scores = self._compat_scores(queries) if self.mode == "compat" else self._bm25_scores(queries)
+            # Rank on the rounded scores the per-section scorer reports
+            scores = np.round(scores, 2)
+            best = _top_k_rows(scores, k)
+        metrics.incr("vector_queries", len(queries))
+        return [
+            [(float(row_scores[i]), self.sections[i]) for i in indices]
+            for row_scores, indices in zip(scores, best)
+        ]
@@ -1,11 +1,24 @@
+import asyncio
+import contextlib
 import json
 import os
 import re
-import fitz  # PyMuPDF
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple, Union
 from datetime import datetime
 from dataclasses import dataclass
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from core.async_pipeline import parse_executor, pipeline
+from core.boilerplate import find_boilerplate
+from core.cache import ExtractionCache
+from core.manifest import MANIFEST_NAME, Manifest
+from core.metrics import RUN_REPORT_STEM, Metrics, collect, current as current_metrics, profiled
+from core.parsed_document import ParsedDocument, open_parsed_document
+from core.section_index import BoundedTopK, SectionIndex, StreamStats, tokenize
+from core.sentence_index import best_windows, segment
+from core.span_classifier import classify_spans, heading_level
 
 # Logging config
 logging.basicConfig(level=logging.INFO)
@@ -22,6 +35,8 @@ class DocumentSection:
     section_title: str
     content: str
     importance_rank: int = 0
+    # Sentence offsets from core.sentence_index.segment, built at ingest
+    sentences: Optional[List[Any]] = None
 
 @dataclass
 class SubSection:
@@ -30,14 +45,31 @@ class SubSection:
     refined_text: str
     page_number: int
 
+# Query term weights and title boosts used by the BM25F ranker. These carry
+# over the calculate_section_relevance weights: e.g. a persona keyword scores
+# 2.0 anywhere plus 1.5 more in the title, i.e. a title boost of 3.5 / 2.0.
+QUERY_FIELD_WEIGHTS = {
+    "persona_keywords": (2.0, 1.75),
+    "job_keywords": (3.0, 5.0 / 3.0),
+    "numbers": (1.5, 1.0),
+    "time_periods": (1.0, 1.0),
+}
+
 # ======================
 # Main Class
 # ======================
 
 class GenericDocumentIntelligence:
-    def __init__(self):
+    def __init__(self, workers: int = 1, cache: Optional[ExtractionCache] = None,
+                 metrics_dir: Optional[str] = None, metrics_format: str = "json"):
         self.processed_documents = []
         self.all_sections = []
+        self.workers = max(1, workers or 1)
+        self.cache = cache
+        # When set, a per-document metrics report (json or prom) is written here
+        self.metrics_dir = metrics_dir
+        self.metrics_format = metrics_format
+        self.document_errors: Dict[str, str] = {}
 
     def load_input_json(self, input_path: str) -> Dict[str, Any]:
         try:
@@ -47,55 +79,158 @@ class GenericDocumentIntelligence:
             logger.error(f"Error loading input file: {e}")
             raise
 
-    def extract_pdf_content(self, pdf_path: str) -> List[Dict[str, Any]]:
+    def extract_pdf_content(self, source: Union[str, ParsedDocument]) -> List[Dict[str, Any]]:
         try:
-            doc = fitz.open(pdf_path)
-            sections = []
-
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                blocks = page.get_text("dict")
-
-                for block in blocks["blocks"]:
-                    if "lines" not in block:
-                        continue
-
-                    for line in block["lines"]:
-                        for span in line["spans"]:
-                            text = span["text"].strip()
-                            if not text or len(text) < 3:
-                                continue
-
-                            font_size = span["size"]
-                            font_flags = span["flags"]
-                            is_bold = bool(font_flags & 2**4)
-
-                            section_info = self._classify_text_block(text, font_size, is_bold, page_num + 1)
-                            if section_info:
-                                sections.append(section_info)
-
-            doc.close()
-            return self._merge_and_clean_sections(sections)
-
+            return self._extract_sections(source)
         except Exception as e:
-            logger.error(f"Error extracting from {pdf_path}: {e}")
+            path = source.path if isinstance(source, ParsedDocument) else source
+            logger.error(f"Error extracting from {path}: {e}")
             return []
 
-    def _classify_text_block(self, text: str, font_size: float, is_bold: bool, page_num: int) -> Optional[Dict[str, Any]]:
-        if len(text) < 5 or text.isdigit():
-            return None
-
-        heading_patterns = [r'^[A-Z][A-Za-z\s]+$', r'^\d+\.?\s+[A-Z]', r'^[IVX]+\.?\s+[A-Z]', r'^[A-Z]{2,}']
-        content_indicators = [r'\.\s+[A-Z]', r',\s+', r';\s+']
+    def _extract_sections(self, source: Union[str, ParsedDocument]) -> List[Dict[str, Any]]:
+        return list(self.iter_pdf_sections(source))
+
+    def iter_pdf_sections(self, source: Union[str, ParsedDocument], memoize_pages: bool = True) -> Iterator[Dict[str, Any]]:
+        """Yield finished sections one at a time as pages are read.
+
+        With memoize_pages=False, page dicts are dropped once consumed, so only
+        the current page and the section being assembled are held in memory.
+        """
+        with open_parsed_document(source) as parsed:
+            yield from self._assemble_sections(self._iter_classified_spans(parsed, memoize_pages))
+
+    def _iter_classified_spans(self, parsed: ParsedDocument, memoize_pages: bool = True) -> Iterator[Dict[str, Any]]:
+        boilerplate = find_boilerplate(parsed, memoize_pages)
+        for page_num in range(1, parsed.page_count + 1):
+            blocks = boilerplate.strip(parsed.page_dict(page_num, memoize_pages))
+            texts, sizes, bolds = [], [], []
+            for block in blocks:
+                if "lines" not in block:
+                    continue
+
+                for line in block["lines"]:
+                    for span in line["spans"]:
+                        text = span["text"].strip()
+                        if not text or len(text) < 3:
+                            continue
+
+                        texts.append(text)
+                        sizes.append(span["size"])
+                        bolds.append(bool(span["flags"] & 2**4))
+
+            # Classify the whole page in one batched call
+            types, _ = classify_spans(texts, sizes, bolds)
+            current_metrics().incr("spans_classified", len(texts))
+            for text, font_size, is_bold, section_type in zip(texts, sizes, bolds, types):
+                if section_type:
+                    yield {
+                        "type": section_type,
+                        "text": text,
+                        "page": page_num,
+                        "font_size": font_size,
+                        "is_bold": is_bold
+                    }
+
+    def extract_documents(self, paths: List[str], async_io: bool = False) -> List[List[Dict[str, Any]]]:
+        """Extract sections for each path, returned in the same order as `paths`.
+
+        With more than one worker the documents are fanned out to a process pool.
+        A document that fails is logged, recorded in `document_errors` and
+        contributes no sections; the rest of the batch is unaffected.
+        Documents already in `cache` are not opened at all.
+        With async_io=True, file reads and cache/metrics writes run in an
+        asyncio pipeline around parsing (see core.async_pipeline).
+        """
+        self.document_errors = {}
+        with_metrics = self.metrics_dir is not None
+        results = [None] * len(paths)
+        pending = []
+        for i, path in enumerate(paths):
+            cached = self.cache.get(path, "sections") if self.cache else None
+            if cached is not None:
+                results[i] = (cached, None)
+                if with_metrics:
+                    self._write_metrics(path, {"counters": {"cache_hits": 1}})
+            else:
+                pending.append(i)
+
+        stored = False
+        if async_io and pending:
+            extracted = self._extract_async([paths[i] for i in pending], with_metrics)
+            # The pipeline's write stage already cached each result
+            stored = True
+        elif self.workers == 1 or len(pending) < 2:
+            extracted = [_extract_document(paths[i], with_metrics) for i in pending]
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(pending))) as pool:
+                futures = [pool.submit(_extract_document, paths[i], with_metrics) for i in pending]
+                extracted = []
+                for future in futures:
+                    try:
+                        extracted.append(future.result())
+                    except Exception as e:
+                        extracted.append(([], f"{type(e).__name__}: {e}", None))
+
+        for i, (sections, error, report) in zip(pending, extracted):
+            results[i] = (sections, error)
+            if not stored:
+                self._store_extraction(paths[i], sections, error, report)
 
-        is_likely_heading = any(re.match(p, text) for p in heading_patterns) or font_size > 12 or is_bold
-        if any(re.search(p, text) for p in content_indicators):
-            is_likely_heading = False
+        all_sections = []
+        for path, (sections, error) in zip(paths, results):
+            if error:
+                logger.error(f"Error extracting from {path}: {error}")
+                self.document_errors[path] = error
+            all_sections.append(sections)
+        return all_sections
+
+    def _store_extraction(self, path: str, sections, error, report) -> None:
+        if self.cache and not error:
+            self.cache.put(path, "sections", sections)
+        if report is not None:
+            self._write_metrics(path, report)
+
+    def _extract_async(self, paths: List[str], with_metrics: bool):
+        """(sections, error, report) per path, read and stored by the async pipeline."""
+        process = partial(_extract_document_bytes, with_metrics=with_metrics)
+
+        def store(path, extracted):
+            self._store_extraction(path, *extracted)
+            return extracted
+
+        async def run():
+            results = {}
+            with parse_executor(min(self.workers, len(paths))) as executor:
+                async for path, extracted, error, _ in pipeline(paths, process, store, executor, self.workers):
+                    results[path] = extracted if error is None else ([], f"{type(error).__name__}: {error}", None)
+            return results
+
+        results = asyncio.run(run())
+        return [results[path] for path in paths]
+
+    def _write_metrics(self, label: str, report: Dict[str, Any]) -> None:
+        metrics = Metrics(os.path.basename(label))
+        metrics.merge(report)
+        metrics.write(self.metrics_dir, self.metrics_format)
+
+    def profile_document(self, pdf_path: str, output_prefix: str) -> Dict[str, Any]:
+        """Extract one document under cProfile and tracemalloc.
+
+        Writes <output_prefix>.pstats and <output_prefix>.mem.txt and returns the
+        document's stage/counter report.
+        """
+        with profiled(output_prefix), collect(os.path.basename(pdf_path)) as metrics:
+            with metrics.stage("extract"):
+                self._extract_sections(pdf_path)
+        return metrics.report()
 
-        section_type = f"H{self._determine_heading_level(text, font_size, is_bold)}" if is_likely_heading else "content"
+    def _classify_text_block(self, text: str, font_size: float, is_bold: bool, page_num: int) -> Optional[Dict[str, Any]]:
+        types, _ = classify_spans([text], [font_size], [is_bold])
+        if types[0] is None:
+            return None
 
         return {
-            "type": section_type,
+            "type": types[0],
             "text": text,
             "page": page_num,
             "font_size": font_size,
@@ -103,35 +238,38 @@ class GenericDocumentIntelligence:
         }
 
     def _determine_heading_level(self, text: str, font_size: float, is_bold: bool) -> int:
-        if font_size > 16 or text.isupper() or re.match(r'^\d+\.\s+[A-Z]', text):
-            return 1
-        elif font_size > 14 or is_bold or re.match(r'^[A-Z]\.\s+[A-Z]', text):
-            return 2
-        else:
-            return 3
+        return heading_level(text, font_size, is_bold)
 
     def _merge_and_clean_sections(self, sections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        cleaned = []
+        return list(self._assemble_sections(sections))
+
+    def _assemble_sections(self, sections: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        metrics = current_metrics()
         current_section = None
+        content_parts = []
 
         for section in sections:
             if section["type"].startswith("H"):
                 if current_section:
-                    cleaned.append(current_section)
+                    yield self._finish_section(current_section, content_parts, metrics)
                 current_section = {
                     "section_title": section["text"],
                     "content": "",
                     "page": section["page"],
                     "level": section["type"]
                 }
+                content_parts = []
             elif section["type"] == "content" and current_section:
-                if current_section["content"]:
-                    current_section["content"] += " "
-                current_section["content"] += section["text"]
+                content_parts.append(section["text"])
 
         if current_section:
-            cleaned.append(current_section)
-        return cleaned
+            yield self._finish_section(current_section, content_parts, metrics)
+
+    def _finish_section(self, section, content_parts, metrics):
+        section["content"] = " ".join(content_parts)
+        section["sentences"] = segment(section["content"])
+        metrics.incr("sections")
+        return section
 
     def extract_keywords_from_context(self, persona: str, job_description: str) -> Dict[str, List[str]]:
         stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by',
@@ -165,28 +303,136 @@ class GenericDocumentIntelligence:
 
         return round(score, 2)
 
+    def build_query(self, keywords: Dict[str, List[str]]) -> Dict[str, tuple]:
+        """Turn extracted keywords into {term: (weight, title_boost)} for SectionIndex."""
+        query = {}
+        for group, (weight, title_boost) in QUERY_FIELD_WEIGHTS.items():
+            for keyword in keywords.get(group, []):
+                for term in tokenize(keyword):
+                    prev_weight, prev_boost = query.get(term, (0.0, 1.0))
+                    query[term] = (prev_weight + weight, max(prev_boost, title_boost))
+        return query
+
     def rank_sections(self, sections, persona, job_description, top_n=10):
+        index = SectionIndex()
+        index.add_sections(sections)
+        return self.rank_index(index, persona, job_description, top_n)
+
+    def rank_index(self, index: SectionIndex, persona, job_description, top_n=10) -> List[DocumentSection]:
         keywords = self.extract_keywords_from_context(persona, job_description)
-        scored = [
-            {
-                "section": s,
-                "score": self.calculate_section_relevance(s, keywords, persona, job_description)
-            } for s in sections
-        ]
-        scored.sort(key=lambda x: x["score"], reverse=True)
+        with current_metrics().stage("ranking"):
+            best = index.top_k(self.build_query(keywords), top_n)
+
+        return self._document_sections(best)
+
+    def rank_stream(self, read_documents: Callable[[], Iterable[Tuple[str, Iterable[Dict[str, Any]]]]],
+                    persona, job_description, top_n=10) -> List[DocumentSection]:
+        """Rank a document stream the way rank_sections does, holding only the best top_n.
+
+        read_documents() yields (name, sections) per document, with sections
+        produced lazily, and is called twice: once to gather the BM25F corpus
+        statistics and once to score (see StreamStats), so every document is
+        extracted twice. Neither pass keeps a document's sections: the first
+        only counts them, the second keeps the document's best top_n. A
+        document whose sections raise is logged and recorded in
+        document_errors under its name. Nothing it yielded before the error is
+        used, and the second pass skips it.
+        """
+        query = self.query_for(persona, job_description)
+
+        def count(sections):
+            document_stats = StreamStats(query)
+            for section in sections:
+                document_stats.add(section)
+            return document_stats
+
+        stats = StreamStats(query)
+        for document_stats in self._fold_documents(read_documents, count):
+            stats.merge(document_stats)
+
+        def score(sections):
+            document_top = BoundedTopK(top_n)
+            for section in sections:
+                document_top.push(stats.score(section), section)
+            return document_top
+
+        top = BoundedTopK(top_n)
+        for document_top in self._fold_documents(read_documents, score):
+            top.merge(document_top)
+
+        return self._document_sections(top.items())
+
+    def _fold_documents(self, read_documents, fold):
+        """Yield fold(sections) for each document read_documents() yields that
+        finishes without an error; failed documents go to document_errors."""
+        for name, sections in read_documents():
+            if name in self.document_errors:
+                continue
+            try:
+                result = fold(sections)
+            except Exception as e:
+                logger.error(f"Error extracting from {name}: {e}")
+                self.document_errors[name] = f"{type(e).__name__}: {e}"
+                continue
+            yield result
+
+    def rank_many(self, sections, persona_jobs, top_n=10, mode="bm25") -> List[List[DocumentSection]]:
+        """Rank one section list for many (persona, job) pairs in a single vectorized pass.
+
+        mode="compat" reproduces calculate_section_relevance scores;
+        mode="bm25" is the sparse-matrix counterpart of rank_sections.
+        Needs numpy and scipy.
+        """
+        from core.vector_scoring import VectorScorer
 
+        keyword_sets = [self.extract_keywords_from_context(persona, job) for persona, job in persona_jobs]
+        queries = keyword_sets if mode == "compat" else [self.build_query(k) for k in keyword_sets]
+        with current_metrics().stage("ranking"):
+            results = VectorScorer(sections, mode).top_k(queries, top_n)
+        return [self._document_sections(best) for best in results]
+
+    def _document_sections(self, scored) -> List[DocumentSection]:
         return [
             DocumentSection(
-                document=s["section"].get("document", "unknown"),
-                page_number=s["section"].get("page", 1),
-                section_title=s["section"].get("section_title", ""),
-                content=s["section"].get("content", ""),
-                importance_rank=i + 1
+                document=section.get("document", "unknown"),
+                page_number=section.get("page", 1),
+                section_title=section.get("section_title", ""),
+                content=section.get("content", ""),
+                importance_rank=i + 1,
+                sentences=section.get("sentences")
             )
-            for i, s in enumerate(scored[:top_n])
+            for i, (_, section) in enumerate(scored)
         ]
 
-    def extract_subsections(self, sections: List[DocumentSection], max_subsections=20) -> List[SubSection]:
+    def iter_corpus_documents(self, input_dir: str, fnames: List[str]) -> Iterator[Tuple[str, Iterator[Dict[str, Any]]]]:
+        """Yield (path, sections) per document, each extracted lazily, page by page,
+        as the caller consumes it (see rank_stream)."""
+        for fname in fnames:
+            fpath = os.path.join(input_dir, fname)
+            yield fpath, self._iter_named_sections(fpath, fname)
+
+    def _iter_named_sections(self, fpath: str, fname: str) -> Iterator[Dict[str, Any]]:
+        for section in self.iter_pdf_sections(fpath, memoize_pages=False):
+            section["document"] = fname
+            yield section
+
+    def query_for(self, persona: str, job_description: str) -> Dict[str, tuple]:
+        return self.build_query(self.extract_keywords_from_context(persona, job_description))
+
+    def extract_subsections(self, sections: List[DocumentSection], max_subsections=20,
+                            query: Optional[Dict[str, tuple]] = None) -> List[SubSection]:
+        """
+        Pick passages from the top five sections.
+        With a query ({term: (weight, title_boost)}, see query_for), every
+        window of three consecutive sentences is scored against the query terms
+        using the sentence index stored at ingest, and the best non-overlapping
+        windows are returned, best first, topped up with unmatched windows in
+        reading order. Without one, each section is cut into
+        fixed three-sentence chunks in reading order.
+        """
+        if query is not None:
+            return self._query_subsections(sections[:5], max_subsections, query)
+
         subsections = []
         for section in sections[:5]:
             sentences = re.split(r'[.!?]+', section.content)
@@ -206,6 +452,21 @@ class GenericDocumentIntelligence:
                 break
         return subsections
 
+    def _query_subsections(self, sections: List[DocumentSection], max_subsections, query) -> List[SubSection]:
+        indexed = [
+            (section.content, section.sentences if section.sentences is not None else segment(section.content))
+            for section in sections
+        ]
+        return [
+            SubSection(
+                document=sections[position].document,
+                section_title=sections[position].section_title,
+                refined_text=self._refine_text(text),
+                page_number=sections[position].page_number
+            )
+            for position, text in best_windows(indexed, query, max_subsections)
+        ]
+
     def _refine_text(self, text):
         text = ' '.join(text.split())
         if text and not text.endswith(('.', '!', '?')):
@@ -214,17 +475,42 @@ class GenericDocumentIntelligence:
                 text = text[:last + 1]
         return text[0].upper() + text[1:] if text else text
 
-    def process_documents(self, input_dir: str, output_dir: str):
-        input_json_path = os.path.join(input_dir, "input.json")
-        if not os.path.exists(input_json_path):
-            raise FileNotFoundError(f"Input JSON not found at {input_json_path}")
+    def build_output(self, input_documents: List[str], persona: str, job: str,
+                     ranked: List[DocumentSection], subs: List[SubSection]) -> Dict[str, Any]:
+        return {
+            "metadata": {
+                "input_documents": input_documents,
+                "persona": persona,
+                "job_to_be_done": job,
+                "processing_timestamp": datetime.now().isoformat()
+            },
+            "extracted_sections": [
+                {
+                    "document": s.document,
+                    "page_number": s.page_number,
+                    "section_title": s.section_title,
+                    "importance_rank": s.importance_rank
+                } for s in ranked
+            ],
+            "sub_section_analysis": [
+                {
+                    "document": s.document,
+                    "section_title": s.section_title,
+                    "refined_text": s.refined_text,
+                    "page_number": s.page_number
+                } for s in subs
+            ]
+        }
 
-        input_data = self.load_input_json(input_json_path)
+    def parse_job(self, input_data: Dict[str, Any]):
+        """Return (persona, job, documents) from an input.json-shaped dict."""
         persona = input_data.get("persona", {}).get("role", "")
         job = input_data.get("job_to_be_done", {}).get("task", "")
         docs = input_data.get("documents", [])
+        return persona, job, docs
 
-        all_sections = []
+    def available_documents(self, input_dir: str, docs: List[Dict[str, Any]]) -> List[str]:
+        fnames = []
         for doc in docs:
             fname = doc.get("filename", "")
             if not fname:
@@ -233,41 +519,105 @@ class GenericDocumentIntelligence:
             if not os.path.exists(fpath):
                 logger.warning(f"Missing file: {fpath}")
                 continue
+            fnames.append(fname)
+        return fnames
+
+    def extract_incremental(self, paths: List[str], manifest: Manifest,
+                            async_io: bool = False) -> List[List[Dict[str, Any]]]:
+        """Like extract_documents, but reuses the manifest's sections for unchanged files.
+
+        Added or modified files are re-extracted, deleted ones are dropped from
+        the manifest, and files that failed are not recorded so they retry next run.
+        """
+        sections = manifest.refresh(paths, "sections", partial(self.extract_documents, async_io=async_io))
+        for path in self.document_errors:
+            manifest.forget(path)
+        logger.info(f"Incremental run: re-extracted {len(manifest.stale)} of {len(paths)} document(s)")
+        return sections
+
+    def process_documents(self, input_dir: str, output_dir: str, streaming: bool = False,
+                          incremental: bool = False, async_io: bool = False):
+        """
+        Rank the sections of the input.json documents and write output.json.
+        With streaming=True, documents are extracted one at a time, page by
+        page, and ranked with the same BM25F scores in two passes (see
+        rank_stream). No document is held whole, so peak memory is one page
+        and the section being assembled plus the top-k, whatever the
+        collection size. Streaming runs in this process,
+        bypasses the cache and writes no per-document metrics reports.
+        With incremental=True, a manifest in output_dir records each document's
+        sections so later runs only re-extract added or modified files.
+        With async_io=True, PDFs are prefetched and parsed from memory so file
+        reads overlap with parsing (see extract_documents).
+        """
+        if streaming and incremental:
+            raise ValueError("streaming and incremental runs can't be combined: streaming keeps no sections to record")
+        input_json_path = os.path.join(input_dir, "input.json")
+        if not os.path.exists(input_json_path):
+            raise FileNotFoundError(f"Input JSON not found at {input_json_path}")
 
-            sections = self.extract_pdf_content(fpath)
-            for s in sections:
-                s["document"] = fname
-            all_sections.extend(sections)
-
-        ranked = self.rank_sections(all_sections, persona, job)
-        subs = self.extract_subsections(ranked)
+        input_data = self.load_input_json(input_json_path)
+        persona, job, docs = self.parse_job(input_data)
+        fnames = self.available_documents(input_dir, docs)
+
+        run_metrics = collect("run") if self.metrics_dir is not None else contextlib.nullcontext()
+        with run_metrics as metrics:
+            if streaming:
+                self.document_errors = {}
+                ranked = self.rank_stream(partial(self.iter_corpus_documents, input_dir, fnames), persona, job)
+            else:
+                all_sections = []
+                paths = [os.path.join(input_dir, f) for f in fnames]
+                if incremental:
+                    manifest = Manifest(os.path.join(output_dir, MANIFEST_NAME))
+                    extracted = self.extract_incremental(paths, manifest, async_io)
+                    manifest.save()
+                else:
+                    extracted = self.extract_documents(paths, async_io)
+                for fname, sections in zip(fnames, extracted):
+                    for s in sections:
+                        s["document"] = fname
+                    all_sections.extend(sections)
+
+                ranked = self.rank_sections(all_sections, persona, job)
+            with current_metrics().stage("subsections"):
+                subs = self.extract_subsections(ranked, query=self.query_for(persona, job))
+        if metrics is not None:
+            metrics.write(self.metrics_dir, self.metrics_format, stem=RUN_REPORT_STEM)
 
         os.makedirs(output_dir, exist_ok=True)
         out_path = os.path.join(output_dir, "output.json")
         with open(out_path, 'w', encoding='utf-8') as f:
-            json.dump({
-                "metadata": {
-                    "input_documents": [d["filename"] for d in docs],
-                    "persona": persona,
-                    "job_to_be_done": job,
-                    "processing_timestamp": datetime.now().isoformat()
-                },
-                "extracted_sections": [
-                    {
-                        "document": s.document,
-                        "page_number": s.page_number,
-                        "section_title": s.section_title,
-                        "importance_rank": s.importance_rank
-                    } for s in ranked
-                ],
-                "sub_section_analysis": [
-                    {
-                        "document": s.document,
-                        "section_title": s.section_title,
-                        "refined_text": s.refined_text,
-                        "page_number": s.page_number
-                    } for s in subs
-                ]
-            }, f, indent=2, ensure_ascii=False)
+            json.dump(self.build_output([d["filename"] for d in docs], persona, job, ranked, subs),
+                      f, indent=2, ensure_ascii=False)
 
         logger.info(f"Saved output to {out_path}")
+
+
+def _extract_document(pdf_path: str, with_metrics: bool = False, data: Optional[bytes] = None):
+    """Process-pool entry point: returns (sections, error, metrics report) for one PDF.
+    With `data`, the PDF is parsed from those bytes instead of being read from pdf_path."""
+    def extract():
+        if data is None:
+            return GenericDocumentIntelligence()._extract_sections(pdf_path)
+        with ParsedDocument(pdf_path, data) as parsed:
+            return GenericDocumentIntelligence()._extract_sections(parsed)
+
+    if not with_metrics:
+        try:
+            return extract(), None, None
+        except Exception as e:
+            return [], f"{type(e).__name__}: {e}", None
+
+    with collect(os.path.basename(pdf_path)) as metrics:
+        try:
+            with metrics.stage("extract"):
+                sections = extract()
+            return sections, None, metrics.report()
+        except Exception as e:
+            return [], f"{type(e).__name__}: {e}", metrics.report()
+
+
+def _extract_document_bytes(pdf_path: str, data: bytes, with_metrics: bool = False):
+    """Async pipeline entry point: _extract_document on prefetched bytes."""
+    return _extract_document(pdf_path, with_metrics, data)
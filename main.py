@@ -1,11 +1,25 @@
 # main.py
+import argparse
+import asyncio
+import contextlib
+import glob
 import fitz
 import time
-from core.extractor import extract_pdf_headings, extract_pdf_content
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from core.async_pipeline import parse_executor, pipeline
+from core.atomic_write import atomic_write
+from core.extractor import extract_headings_for_pages, extract_pdf_headings
+from core.metrics import collect, current as current_metrics
+from core.font_profile import FontProfile
+from core.outline import level_headings, level_headings_by_profile, render_outline, write_outline_json
+from core.parsed_document import ParsedDocument, open_parsed_document
+from core.toc import toc_headings, uncovered_pages
 #from sentence_transformers import SentenceTransformer, util
 
-import json
 import os
+import sys
 from pathlib import Path
 
 
@@ -13,81 +27,19 @@ from pathlib import Path
 
 
 def classify_and_print_headings(headings):
-    # Define font strength hierarchy (modify as needed)
-    font_strength = {
-        "Arial-Black": 5,
-        "Arial-BoldMT": 4,
-        "Arial-BoldItalicMT": 3,
-        "Arial-ItalicMT": 2,
-        "ArialMT": 1
-    }
-    process_front_page = should_include_front_page(headings)
-
-
-    stack = []
-
-    for heading in headings:
-
-        if not process_front_page and heading.get('page', 0) == 1:
-            continue
-        if heading.get('size', 0) > 15:
-            heading['level'] = 1
-            stack = [heading]  
-            continue
-
-        while stack:
-            top = stack[-1]
-            top_size = top.get('size', 0)
-            curr_size = heading.get('size', 0)
-
-            if top_size > curr_size:
-                heading['level'] = top.get('level', 0) + 1
-                break
-            elif top_size == curr_size:
-                top_str = font_strength.get(top.get('font'), 0)
-                curr_str = font_strength.get(heading.get('font'), 0)
-
-                if top_str > curr_str:
-                    heading['level'] = top.get('level', 0) + 1
-                    break
-                elif top_str == curr_str:
-                    if heading.get('y', 0) < top.get('y', 0):
-                        stack.pop()
-                        continue
-                    else:
-                        heading['level'] = top.get('level', 1)
-                        stack.pop()
-                        break
-                else:
-                    stack.pop()
-            else:
-                stack.pop()
-
-        if not stack:
-            heading['level'] = 1
-
-        stack.append(heading)
-
-    # Print final results
-    print("\nDocument Structure:\n")
-    for heading in headings:
-        if 'level' not in heading:
-            continue
+    """Level the headings and print the document structure; returns the leveled headings."""
+    leveled = level_headings(headings)
+    render_outline(leveled, "text", sys.stdout)
+    return leveled
 
-        indent = '    ' * (heading['level'] - 1)
-        print(f"{indent}L{heading['level']}: {heading.get('text', '')}")
-        print(f"{indent}   Page: {heading.get('page', '?')}, Size: {heading.get('size', '?')}")
-        print(f"{indent}   Font: {heading.get('font', '?')}")
-        print("-" * 60)
 
-
-def extract_pdf_title(pdf_path):
+def extract_pdf_title(source):
     """Extract title from first page by finding largest consecutive text blocks with similar styling."""
-    doc = fitz.open(pdf_path)
-    page = doc[0]
+    with open_parsed_document(source) as parsed:
+        page_dict = parsed.page_dict(1)
 
     # Get text blocks with full formatting information
-    blocks = page.get_text("dict")["blocks"]
+    blocks = page_dict["blocks"]
 
     # Filter and score potential title blocks
     candidates = []
@@ -126,137 +78,294 @@ def extract_pdf_title(pdf_path):
 
     # Additional verification (optional)
     bbox = fitz.Rect(best_group[0]["bbox"])
-    if bbox.y0 > page.rect.height * 0.3:  # Not in top 30% of page
+    if bbox.y0 > page_dict["height"] * 0.3:  # Not in top 30% of page
         return None
 
-    doc.close()
     return title if title else None
 
 
-def should_include_front_page(headings):
-    """
-    Determines if front page should be included in structure analysis based on:
-    1. Number of headings on front page (page 1)
-    2. Positioning of headings
-    3. Total page count
-
-    Returns: True if front page should be included, False otherwise
-    """
-    if not headings:
-        return False
+OUTLINE_SOURCES = ("auto", "toc", "heuristic")
+LEVELINGS = ("stack", "profile")
 
-    # Count total pages by finding max page number
-    total_pages = max(h.get('page', 0) for h in headings)
 
-    # Get all front page (page 1) headings
-    front_page_headings = [h for h in headings if h.get('page') == 1]
+def level_extracted_headings(parsed, headings, leveling="stack", pages=None):
+    """Level heuristic headings with the size/font-strength stack, or by rank
+    among the document's own heading styles (leveling="profile").
+    The profile covers `pages` if given, else the whole document, so only
+    pages the heuristics already parsed are read."""
+    with current_metrics().stage("outline_leveling"):
+        if leveling == "profile":
+            return level_headings_by_profile(headings, FontProfile.from_document(parsed, pages))
+        return level_headings(headings)
 
-    # Case 1: Single-page document - always include
-    if total_pages == 1:
-        return True
 
-    # Case 2: Front page has insufficient content (1-2 headings)
-    if len(front_page_headings) <= 2:
-        return False
+def outline_headings(parsed, outline_source="auto", leveling="stack"):
+    """
+    Leveled headings for an open document and where they came from
+    ("toc", "toc+heuristic" or "heuristic").
+    "auto" uses a plausible bookmark tree and runs the span heuristics only on
+    long unbookmarked front matter, or on every long stretch of pages no
+    bookmark points into when the tree is sparse (see uncovered_pages),
+    falling back to the heuristics for the whole document when there is no
+    usable tree.
+    "toc" never runs the heuristics; "heuristic" never reads the bookmarks.
+    `leveling` applies to heuristic headings (see level_extracted_headings).
+    """
+    metrics = current_metrics()
+    if outline_source != "heuristic":
+        with metrics.stage("toc"):
+            toc = toc_headings(parsed)
+        if toc is not None or outline_source == "toc":
+            toc = toc or []
+            metrics.incr("toc_entries", len(toc))
+            gaps = uncovered_pages(toc, parsed.page_count) if outline_source == "auto" else []
+            if not gaps:
+                return toc, "toc"
+            leveled = level_extracted_headings(parsed, extract_headings_for_pages(parsed, gaps), leveling, gaps)
+            return sorted(toc + leveled, key=lambda h: (h["page"], h.get("y", 0))), "toc+heuristic"
 
-    # Case 3: Check if front page headings are positioned like titles
-    y_positions = [h.get('y', 0) for h in front_page_headings]
-    avg_y = sum(y_positions) / len(y_positions) if y_positions else 0
+    return level_extracted_headings(parsed, extract_pdf_headings(parsed), leveling), "heuristic"
 
-    # If most headings are in top half of page, likely a title page
-    if avg_y < 300:  # Adjust threshold based on typical page height
-        return False
 
-    # Default case: Include front page
-    return True
+def outline_path(pdf_path, output_dir="outputs"):
+    return Path(output_dir) / f"{Path(pdf_path).stem}_outline.json"
 
 
-def process_pdf_to_json(pdf_path):
+def process_pdf_to_json(pdf_path, output_dir="outputs", metrics_dir=None, metrics_format="json",
+                        outline_source="auto", leveling="stack"):
     """
     Process a PDF file and save heading structure in specified JSON format
+    outline_source and leveling pick how the outline is built (see outline_headings).
+    With metrics_dir, a stage/counter report for the PDF is written there too.
     Returns: Path to saved JSON file or None if failed
     """
+    return _outline_with_metrics(pdf_path, output_dir, metrics_dir, metrics_format, outline_source, leveling)[0]
+
+
+def _outline_with_metrics(pdf_path, output_dir, metrics_dir, metrics_format, outline_source="auto",
+                          leveling="stack"):
+    if metrics_dir is None:
+        return _process_pdf_to_json(pdf_path, output_dir, outline_source, leveling)
+    with collect(Path(pdf_path).name) as metrics:
+        result = _process_pdf_to_json(pdf_path, output_dir, outline_source, leveling)
+    metrics.write(metrics_dir, metrics_format)
+    return result
+
+
+def _process_pdf_to_json(pdf_path, output_dir, outline_source="auto", leveling="stack"):
+    """Returns (json_path or None, page count)."""
+    metrics = current_metrics()
+    page_count = 0
     try:
         # Create outputs directory if not exists (with full permissions)
-        output_dir = Path("outputs")
-        output_dir.mkdir(exist_ok=True, mode=0o777)
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True, mode=0o777)
 
         # Generate output filename
-        pdf_name = Path(pdf_path).stem
-        json_path = output_dir / f"{pdf_name}_outline.json"
+        json_path = outline_path(pdf_path, output_dir)
 
         # Verify PDF exists
         if not Path(pdf_path).exists():
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
 
-        # Extract and classify headings
-        headings = classify_and_print_headings(extract_pdf_headings(pdf_path))
-
-        # Prepare JSON in specified format
-        result = {
-            "title": "Sample Document Title",  # Replace with your title extraction
-            "outline": [
-                {
-                    "level": f"H{heading['level']}",
-                    "text": heading.get('text', '').strip(),
-                    "page": heading.get('page', 1) - 1  # Converting to 0-based index
-                }
-                for heading in headings
-            ]
-        }
-
-        # Save to JSON with verification
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
-
-        # Verify file was created
-        if not json_path.exists():
-            raise IOError(f"Failed to create JSON file at {json_path}")
-
-        print(f"Successfully created: {json_path}")
-        return json_path
+        title, leveled, page_count = _build_outline(pdf_path, outline_source, leveling)
+        with metrics.stage("write"):
+            _write_outline(json_path, title, leveled)
+
+        return json_path, page_count
 
     except Exception as e:
         print(f"Error processing {pdf_path}: {str(e)}")
-        return None
+        return None, page_count
 
 
-if __name__ == "__main__":
-    files=["South of France - Cuisine.pdf","South of France - History.pdf","South of France - Restaurants and Hotels.pdf","South of France - Tips and Tricks.pdf","South of France - Traditions and Culture.pdf"]
-    files2=["file01.pdf","file02.pdf","file03.pdf"]
-    start_time = time.time()
-    for file_path in files2:
+def _build_outline(pdf_path, outline_source="auto", leveling="stack", data=None):
+    """Returns (title, leveled headings, page count) for one PDF, parsed from `data` if given."""
+    # Extract title and headings from a single parse of the PDF; with a
+    # usable bookmark tree only the title page is parsed
+    with ParsedDocument(pdf_path, data) as parsed:
+        page_count = parsed.page_count
+        title = extract_pdf_title(parsed)
+        leveled, _ = outline_headings(parsed, outline_source, leveling)
+    return title, leveled, page_count
+
+
+def _write_outline(json_path, title, leveled):
+    # Stream the outline to a temp file in the same directory and rename,
+    # so readers never see a half-written outline
+    with atomic_write(json_path, prefix=f".{json_path.stem}-") as f:
+        write_outline_json(f, title or "", leveled)
 
-        try:
-            output_path = process_pdf_to_json(file_path)
-            print(f"Successfully processed: {output_path}")
-        except Exception as e:
-            print(f"Error processing {file_path}: {str(e)}")
-        # for i, h in enumerate(headings, start=1):
-        #     print(f"   {h['text']}")
 
+def _outline_job(pdf_path, output_dir, metrics_dir, metrics_format, outline_source="auto", leveling="stack"):
+    """Process-pool entry point: returns (pdf_path, json_path, pages, seconds)."""
+    start = time.perf_counter()
+    json_path, pages = _outline_with_metrics(pdf_path, output_dir, metrics_dir, metrics_format,
+                                             outline_source, leveling)
+    return pdf_path, json_path, pages, time.perf_counter() - start
 
 
-    elapsed = time.time() - start_time
-    print(f"Execution time: {elapsed:.4f} seconds")
-    # Step 2: Define your headings (order preserved as they appear in the PDF)
+def collect_pdfs(inputs):
+    """Expand directories and glob patterns into a sorted, de-duplicated PDF list."""
+    pdfs = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            pdfs.update(str(p) for p in Path(item).glob("*.pdf"))
+        else:
+            pdfs.update(p for p in glob.glob(item) if p.lower().endswith(".pdf"))
+    return sorted(pdfs)
 
 
-    # Step 3: Embed all headings into semantic vectors
+def is_up_to_date(pdf_path, output_dir):
+    """True when the outline JSON exists and is newer than its source PDF."""
+    try:
+        return outline_path(pdf_path, output_dir).stat().st_mtime >= Path(pdf_path).stat().st_mtime
+    except FileNotFoundError:
+        return False
+
 
-    #print_headings_with_levels(sorted_headings)
+def run_outline_batch(pdfs, output_dir="outputs", workers=1, max_in_flight=None,
+                      metrics_dir=None, metrics_format="json", outline_source="auto", leveling="stack"):
+    """
+    Outline every PDF in a process pool with at most max_in_flight jobs queued.
+    Yields (pdf_path, json_path, pages, seconds) as each file completes.
+    """
+    workers = max(1, workers or 1)
+    if workers == 1:
+        for pdf_path in pdfs:
+            yield _outline_job(pdf_path, output_dir, metrics_dir, metrics_format, outline_source, leveling)
+        return
+
+    max_in_flight = max_in_flight or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = {}
+        for pdf_path in pdfs:
+            if len(in_flight) >= max_in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield _job_result(future, *in_flight.pop(future))
+            try:
+                future = pool.submit(_outline_job, pdf_path, output_dir, metrics_dir, metrics_format,
+                                     outline_source, leveling)
+            except BrokenProcessPool as e:
+                print(f"Error processing {pdf_path}: {e}")
+                yield pdf_path, None, 0, 0.0
+                continue
+            in_flight[future] = (pdf_path, time.perf_counter())
+        for future in as_completed(in_flight):
+            yield _job_result(future, *in_flight[future])
+
+
+def _job_result(future, pdf_path, start):
+    """A finished pool job's result; a job that raised (e.g. its worker died) is a failed file."""
+    try:
+        return future.result()
+    except Exception as e:
+        print(f"Error processing {pdf_path}: {type(e).__name__}: {e}")
+        return pdf_path, None, 0, time.perf_counter() - start
 
-    # Step 2: Print heading details
-    # print("📘 Extracted Headings with Properties:\n")
-    # for i, h in enumerate(headings, start=1):
-    #     print(f"🔹 Heading {i}")
-    #     for key, value in h.items():
-    #         print(f"   {key}: {value}")
-    #     print("-" * 60)
 
-    # Optional Step 3: Extract and print content between headings
-    # content_blocks = extract_pdf_content(file_path, headings)
-    # for block in content_blocks:
-    #     print(f"\n🔷 Heading: {block['heading']}")
-    #     print(f"📄 Pages: {block['page_start']} to {block['page_end']}")
-    #     print(f"📝 Content:\n{block['content']}")
\ No newline at end of file
+def _outline_from_bytes(pdf_path, data, outline_source="auto", leveling="stack", metrics_dir=None,
+                        metrics_format="json"):
+    """Async pipeline process stage: parse prefetched bytes into an outline."""
+    if metrics_dir is None:
+        return _build_outline(pdf_path, outline_source, leveling, data)
+    with collect(Path(pdf_path).name) as metrics:
+        result = _build_outline(pdf_path, outline_source, leveling, data)
+    metrics.write(metrics_dir, metrics_format)
+    return result
+
+
+def run_outline_pipeline(pdfs, output_dir="outputs", workers=1, max_in_flight=None,
+                         metrics_dir=None, metrics_format="json", outline_source="auto", leveling="stack"):
+    """
+    Like run_outline_batch, but through an asyncio pipeline: PDF bytes are
+    prefetched by I/O threads, parsed with fitz.open(stream=...) in the worker
+    pool and outlines are written by I/O threads, so file reads and writes
+    overlap with parsing. At most max_in_flight PDFs are held at once.
+    Yields (pdf_path, json_path, pages, seconds) as each file is written.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True, mode=0o777)
+    workers = max(1, workers or 1)
+    process = partial(_outline_from_bytes, outline_source=outline_source, leveling=leveling,
+                      metrics_dir=metrics_dir, metrics_format=metrics_format)
+
+    def write(pdf_path, outline):
+        title, leveled, page_count = outline
+        json_path = outline_path(pdf_path, output_dir)
+        _write_outline(json_path, title, leveled)
+        return json_path, page_count
+
+    async def run():
+        with parse_executor(workers) as executor:
+            async with contextlib.aclosing(pipeline(pdfs, process, write, executor, workers,
+                                                    max_in_flight)) as results:
+                async for pdf_path, written, error, seconds in results:
+                    if error is not None:
+                        print(f"Error processing {pdf_path}: {error}")
+                        written = (None, 0)
+                    yield pdf_path, written[0], written[1], seconds
+
+    loop = asyncio.new_event_loop()
+    agen = run()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(agen.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        loop.run_until_complete(agen.aclose())
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract heading outlines from PDFs")
+    parser.add_argument("inputs", nargs="*", default=["input"],
+                        help="PDF files, glob patterns or directories (default: input)")
+    parser.add_argument("--output-dir", default="outputs")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--max-in-flight", type=int,
+                        help="most PDFs queued to the pool at once (default: 2 x workers)")
+    parser.add_argument("--force", action="store_true",
+                        help="re-process PDFs whose outline is already newer than the source")
+    parser.add_argument("--async-io", action="store_true",
+                        help="prefetch PDFs and write outlines from I/O threads so I/O overlaps parsing")
+    parser.add_argument("--metrics-dir", help="write a per-PDF stage/counter report into this directory")
+    parser.add_argument("--metrics-format", choices=("json", "prom"), default="json")
+    parser.add_argument("--outline-source", choices=OUTLINE_SOURCES, default="auto",
+                        help="use the PDF bookmark tree when plausible (auto), only bookmarks (toc), "
+                             "or always the span heuristics (heuristic)")
+    parser.add_argument("--leveling", choices=LEVELINGS, default="stack",
+                        help="level headings by size/font-strength stack, or by rank among "
+                             "the document's own heading styles (profile)")
+    args = parser.parse_args()
+
+    pdfs = collect_pdfs(args.inputs)
+    todo = pdfs if args.force else [p for p in pdfs if not is_up_to_date(p, args.output_dir)]
+    skipped = len(pdfs) - len(todo)
+
+    start_time = time.perf_counter()
+    done = failed = pages = 0
+    run = run_outline_pipeline if args.async_io else run_outline_batch
+    for pdf_path, json_path, page_count, seconds in run(
+            todo, args.output_dir, args.workers, args.max_in_flight, args.metrics_dir, args.metrics_format,
+            args.outline_source, args.leveling):
+        pages += page_count
+        if json_path is None:
+            failed += 1
+            print(f"FAILED {pdf_path} ({seconds:.3f}s)")
+        else:
+            done += 1
+            print(f"{seconds:8.3f}s  {page_count:5d} pages  {pdf_path} -> {json_path}")
+
+    elapsed = time.perf_counter() - start_time
+    print(f"Processed {done} PDF(s), {failed} failed, {skipped} up to date, in {elapsed:.3f}s")
+    if elapsed > 0 and todo:
+        print(f"Throughput: {pages / elapsed:.1f} pages/sec, {len(todo) / elapsed:.2f} docs/sec")
+
+
+if __name__ == "__main__":
+    main()
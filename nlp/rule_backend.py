@@ -0,0 +1,151 @@
+import re
+
+# A cheap stand-in for the spaCy check "has a nominal subject and a main verb".
+# It needs no model: a small verb lexicon finds the verb, and any non-function
+# word (or subject pronoun) in front of it counts as the subject. Imperatives
+# such as "Consider the following:" have no subject and are not sentence-like,
+# and bare noun phrases such as "Wine tasting:" have no verb.
+
+WORD_PATTERN = re.compile(r"[A-Za-z']+")
+
+SUBJECT_PRONOUNS = {
+    "i", "you", "he", "she", "it", "we", "they", "this", "that", "these", "those",
+    "there", "who", "which", "one", "everyone", "everything", "someone", "something",
+    "anyone", "anything", "nobody", "nothing", "each", "both", "many", "most", "some",
+}
+
+FUNCTION_WORDS = {
+    "a", "an", "the", "and", "or", "but", "nor", "so", "yet", "for", "of", "in", "on",
+    "at", "to", "by", "with", "from", "into", "onto", "about", "as", "if", "than",
+    "then", "when", "while", "where", "how", "what", "why", "not", "no", "all", "any",
+    "my", "your", "his", "her", "its", "our", "their", "very", "also", "just", "here",
+    "before", "after", "during", "without", "within", "between", "through", "over",
+    "under", "up", "down", "out", "off", "near", "per", "via", "vs",
+}
+
+AUXILIARIES = {
+    "can", "could", "will", "would", "shall", "should", "may", "might", "must",
+    "do", "does", "did", "cannot", "won't", "don't", "doesn't", "didn't",
+    "can't", "shouldn't", "wouldn't", "couldn't", "let's",
+}
+
+# Forms of "be" are never the verb themselves (spaCy tags them AUX), so
+# "Prices are high:" is not sentence-like, but they are not a subject either.
+BE_FORMS = {"be", "am", "is", "are", "was", "were", "been", "being", "isn't", "aren't", "wasn't", "weren't"}
+
+# A verb-looking word right after one of these is an infinitive or a noun
+# ("places to visit", "the following"), not the predicate of a clause.
+NON_PREDICATE_MARKERS = {
+    "to", "a", "an", "the", "this", "that", "these", "those", "my", "your", "his",
+    "her", "its", "our", "their", "of", "for", "with", "by", "in", "on", "at",
+}
+
+# Base forms of common main verbs; inflections are generated below.
+BASE_VERBS = """
+accept add agree allow appear apply arrive ask avoid become begin believe bring build buy
+call carry change check choose come consider contain continue cook cover create cross decide
+describe design develop discover drink drive eat enjoy ensure enter expect experience
+explain explore feel fill find finish fit follow forget get give go grow happen hear help hold
+hope include increase involve join keep know last learn leave let like listen live look lose
+love make mean meet miss move need note offer open order own pack pay plan play prefer prepare
+present produce protect provide put reach read receive recommend reduce remain remember rent
+require rest return run save say see seem sell send serve set show sit sleep speak spend stand
+shop start stay stop suggest support take talk taste teach tell think travel try turn understand
+use visit wait walk want watch wear win wish work write
+""".split()
+
+IRREGULAR_FORMS = """
+became began begun bought brought built came chose chosen did done drank drunk drove driven ate
+eaten felt found forgot forgotten gave given went gone got gotten grew grown had has have having
+heard held kept knew known left lost made meant met paid put read ran said saw seen sold sent set
+showed shown sat slept spoke spoken spent stood taught took taken told thought tried understood wore
+worn won wrote written
+""".split()
+
+# Bases whose past tense is irregular: no "-ed" form is generated for them,
+# so "see" does not produce the noun "seed".
+IRREGULAR_BASES = set("""
+become begin bring build buy choose come drink drive eat feel find forget get give go grow hear
+hold keep know leave let lose make mean meet pay put read run say see sell send set sit sleep speak
+spend stand take teach tell think understand wear win write
+""".split())
+
+# Two-syllable bases stressed on the last syllable double their final consonant too
+STRESSED_FINAL = {"begin", "forget", "prefer"}
+
+VOWELS = "aeiou"
+
+
+def _doubles_final(base):
+    # plan -> planning, stop -> stopped: one vowel, then a consonant other than w/x/y
+    if base in STRESSED_FINAL:
+        return True
+    if len(base) < 3 or base[-1] in VOWELS + "wxy" or base[-2] not in VOWELS or base[-3] in VOWELS:
+        return False
+    return sum(1 for i, c in enumerate(base) if c in VOWELS and (i == 0 or base[i - 1] not in VOWELS)) == 1
+
+
+def _inflections(base):
+    forms = {base}
+    if base.endswith("ee"):
+        forms.update({base + "s", base + "d", base + "ing"})
+    elif base.endswith("e"):
+        forms.update({base + "s", base + "d", base[:-1] + "ing"})
+    elif base.endswith("y") and base[-2:-1] not in VOWELS:
+        forms.update({base[:-1] + "ies", base[:-1] + "ied", base + "ing"})
+    elif base.endswith(("s", "sh", "ch", "x", "o")):
+        forms.update({base + "es", base + "ed", base + "ing"})
+    elif _doubles_final(base):
+        doubled = base + base[-1]
+        forms.update({base + "s", doubled + "ed", doubled + "ing"})
+    else:
+        forms.update({base + "s", base + "ed", base + "ing"})
+    if base == "travel":
+        # Both spellings are common
+        forms.update({"travelled", "travelling"})
+    if base in IRREGULAR_BASES:
+        forms = {f for f in forms if not f.endswith("ed") or f == base}
+    return forms
+
+
+MAIN_VERBS = {form for base in BASE_VERBS for form in _inflections(base)} | set(IRREGULAR_FORMS)
+
+# Verb forms that double as nouns: "tasting", "visits", "offers", "travel"
+NOUN_LIKE_FORMS = {f for f in MAIN_VERBS if f in BASE_VERBS or f.endswith(("s", "ing"))}
+
+
+def _is_content_word(word):
+    return (
+        word not in FUNCTION_WORDS and word not in SUBJECT_PRONOUNS and
+        word not in AUXILIARIES and word not in BE_FORMS
+    )
+
+
+def _in_noun_compound(words, idx):
+    # "Museum visits", "Family travel tips": a noun-like verb form with only
+    # bare nouns around it, no determiner, pronoun or auxiliary anywhere
+    return (
+        words[idx] in NOUN_LIKE_FORMS and
+        all(_is_content_word(w) for w in words[:idx]) and
+        all(_is_content_word(w) and w not in MAIN_VERBS for w in words[idx + 1:])
+    )
+
+
+def is_sentence_like(text):
+    words = [w.lower() for w in WORD_PATTERN.findall(text)]
+    for idx, word in enumerate(words):
+        previous = words[idx - 1] if idx > 0 else None
+        if previous in NON_PREDICATE_MARKERS:
+            continue
+        if word not in MAIN_VERBS and not (previous in AUXILIARIES and word not in FUNCTION_WORDS):
+            continue
+        if _in_noun_compound(words, idx):
+            continue
+        before = [w for w in words[:idx] if w not in AUXILIARIES and w not in BE_FORMS]
+        if any(w in SUBJECT_PRONOUNS or (w not in FUNCTION_WORDS and w not in MAIN_VERBS) for w in before):
+            return True
+    return False
+
+
+def classify(texts):
+    return [is_sentence_like(text) for text in texts]
@@ -1,8 +1,64 @@
-import spacy
-nlp = spacy.load("en_core_web_sm")
+import os
+from collections import OrderedDict
+
+from core.metrics import current as current_metrics
+
+# Sentence-likeness backends: "rules" is a model-free lexicon classifier and the
+# default; "spacy" runs the dependency parser and is the opt-in accurate mode.
+BACKENDS = ("rules", "spacy")
+DEFAULT_BACKEND = os.environ.get("SENTENCE_BACKEND", "rules")
+MEMO_SIZE = 4096
+
+_backend = None
+_memo = OrderedDict()
+
+
+def set_backend(name):
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown sentence backend {name!r}; expected one of {BACKENDS}")
+    if name != _backend:
+        _memo.clear()
+    _backend = name
+
+
+def get_backend():
+    if _backend is None:
+        set_backend(DEFAULT_BACKEND)
+    return _backend
+
+
+def _classify(texts):
+    metrics = current_metrics()
+    metrics.incr("sentence_texts", len(texts))
+    if get_backend() == "spacy":
+        metrics.incr("spacy_calls")
+        from nlp import spacy_backend
+        return spacy_backend.classify(texts)
+    from nlp import rule_backend
+    return rule_backend.classify(texts)
+
+
+def _remember(text, value):
+    _memo[text] = value
+    if len(_memo) > MEMO_SIZE:
+        _memo.popitem(last=False)
+
 
 def is_sentence_like(text):
-    doc = nlp(text)
-    has_subject = any(tok.dep_ in ("nsubj", "nsubjpass") for tok in doc)
-    has_verb = any(tok.pos_ == "VERB" for tok in doc)
-    return has_subject and has_verb
+    value = _memo.get(text)
+    if value is not None:
+        _memo.move_to_end(text)
+        return value
+    value = _classify([text])[0]
+    _remember(text, value)
+    return value
+
+
+def is_sentence_like_batch(texts):
+    """Classify many texts in one backend call (one nlp.pipe pass for spaCy); results are memoized."""
+    missing = [text for text in dict.fromkeys(texts) if text not in _memo]
+    if missing:
+        for text, value in zip(missing, _classify(missing)):
+            _remember(text, value)
+    return [is_sentence_like(text) for text in texts]
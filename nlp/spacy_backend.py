@@ -0,0 +1,25 @@
+MODEL_NAME = "en_core_web_sm"
+# is_sentence_like only reads dependency labels and coarse POS tags, which come
+# from the tagger, parser and attribute_ruler; NER and lemmas are never used.
+EXCLUDED_PIPES = ["ner", "lemmatizer"]
+
+_nlp = None
+
+
+def get_nlp():
+    """Load the spaCy model on first use rather than at import time."""
+    global _nlp
+    if _nlp is None:
+        import spacy
+        _nlp = spacy.load(MODEL_NAME, exclude=EXCLUDED_PIPES)
+    return _nlp
+
+
+def _doc_is_sentence_like(doc):
+    has_subject = any(tok.dep_ in ("nsubj", "nsubjpass") for tok in doc)
+    has_verb = any(tok.pos_ == "VERB" for tok in doc)
+    return has_subject and has_verb
+
+
+def classify(texts):
+    return [_doc_is_sentence_like(doc) for doc in get_nlp().pipe(texts)]
@@ -1,5 +1,7 @@
 import os
+import argparse
 import logging
+from core.cache import DEFAULT_MAX_BYTES, ExtractionCache
 from document_processor import GenericDocumentIntelligence
 
 # Configure logging
@@ -12,6 +14,36 @@ def main():
     Main entry point for local or Docker execution.
     Automatically sets correct input/output paths.
     """
+    parser = argparse.ArgumentParser(description="Persona-driven document intelligence")
+    parser.add_argument("--workers", type=int,
+                        help="processes used to extract documents in parallel (default: CPU count)")
+    parser.add_argument("--cache", metavar="PATH",
+                        help="SQLite extraction cache; unchanged PDFs are not re-parsed on later runs")
+    parser.add_argument("--cache-max-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="size bound of the extraction cache before LRU eviction")
+    parser.add_argument("--cache-prune", action="store_true",
+                        help="drop cache entries written by other extractor versions, then exit")
+    parser.add_argument("--streaming", action="store_true",
+                        help="extract page by page and rank in two passes, keeping memory bounded by one page "
+                             "plus the top sections; same ranking, but single-process and uncached")
+    parser.add_argument("--incremental", action="store_true",
+                        help="keep a manifest in the output directory and only re-extract changed PDFs")
+    parser.add_argument("--async-io", action="store_true",
+                        help="prefetch PDFs and write cache/metrics asynchronously so I/O overlaps parsing")
+    parser.add_argument("--metrics-dir",
+                        help="write stage/counter reports into this directory: one per extracted PDF (none with "
+                             "--streaming) and run-summary for the whole run")
+    parser.add_argument("--metrics-format", choices=("json", "prom"), default="json",
+                        help="report format: JSON or Prometheus textfile")
+    parser.add_argument("--profile", metavar="PDF",
+                        help="profile extraction of a single PDF with cProfile and tracemalloc, then exit")
+    args = parser.parse_args()
+    if args.streaming:
+        # Streaming extracts in this process and never stores sections
+        for flag, value in (("--workers", args.workers), ("--cache", args.cache), ("--async-io", args.async_io),
+                            ("--incremental", args.incremental)):
+            if value:
+                parser.error(f"--streaming cannot be combined with {flag}")
 
     # Detect environment
     running_in_docker = os.path.exists("/.dockerenv")
@@ -26,8 +58,21 @@ def main():
         output_dir = os.path.join(os.getcwd(), "output")
 
     try:
-        processor = GenericDocumentIntelligence()
-        processor.process_documents(input_dir, output_dir)
+        cache = ExtractionCache(args.cache, max_bytes=args.cache_max_mb * 1024 * 1024) if args.cache else None
+        if args.cache_prune:
+            if cache is None:
+                parser.error("--cache-prune requires --cache")
+            logger.info(f"Pruned {cache.prune()} cache entries from other extractor versions")
+            return
+        processor = GenericDocumentIntelligence(workers=args.workers or os.cpu_count(), cache=cache,
+                                                metrics_dir=args.metrics_dir, metrics_format=args.metrics_format)
+        if args.profile:
+            prefix = os.path.join(args.metrics_dir or output_dir, os.path.splitext(os.path.basename(args.profile))[0])
+            report = processor.profile_document(args.profile, prefix)
+            logger.info(f"Profile written to {prefix}.pstats / {prefix}.mem.txt: {report}")
+            return
+        processor.process_documents(input_dir, output_dir, streaming=args.streaming,
+                                    incremental=args.incremental, async_io=args.async_io)
         print("✅ Processing completed successfully!")
     except Exception as e:
         logger.error(f"❌ Processing failed: {e}")
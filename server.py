@@ -0,0 +1,175 @@
+import os
+import json
+import argparse
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from core.cache import ExtractionCache
+from core.section_index import SectionIndex
+from document_processor import GenericDocumentIntelligence
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class WarmCorpus:
+    """A document directory extracted and indexed once, then kept up to date.
+
+    `refresh` compares each PDF's (mtime, size) with what was indexed and only
+    re-extracts added or modified files; deleted files are dropped from the index.
+    A file whose re-extraction fails keeps its previously indexed sections and
+    is retried on the next refresh.
+    """
+
+    def __init__(self, processor: GenericDocumentIntelligence, input_dir: str):
+        self.processor = processor
+        self.input_dir = input_dir
+        self.index = SectionIndex()
+        self._stats = {}
+        self._lock = threading.RLock()
+
+    def documents(self):
+        with self._lock:
+            return sorted(self._stats)
+
+    def refresh(self):
+        current = {}
+        for fname in sorted(os.listdir(self.input_dir)):
+            if not fname.lower().endswith(".pdf"):
+                continue
+            stat = os.stat(os.path.join(self.input_dir, fname))
+            current[fname] = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            removed = [f for f in self._stats if f not in current]
+            changed = [f for f, stat in current.items() if self._stats.get(f) != stat]
+        if not removed and not changed:
+            return False
+
+        # Extract outside the lock so queries keep being served meanwhile
+        paths = [os.path.join(self.input_dir, f) for f in changed]
+        extracted = self.processor.extract_documents(paths)
+        errors = self.processor.document_errors
+
+        with self._lock:
+            for fname in removed:
+                self.index.remove_document(fname)
+                self._stats.pop(fname, None)
+            for fname, path, sections in zip(changed, paths, extracted):
+                if path in errors:
+                    # Keep what was indexed before; no stat recorded, so the next poll retries
+                    continue
+                self.index.remove_document(fname)
+                for s in sections:
+                    s["document"] = fname
+                self.index.add_sections(sections)
+                self._stats[fname] = current[fname]
+
+        logger.info(f"Indexed {len(changed) - len(errors)} changed, dropped {len(removed)} removed, "
+                    f"{len(errors)} failed document(s); {len(self.index)} sections in corpus")
+        return True
+
+    def query(self, persona: str, job: str):
+        with self._lock:
+            ranked = self.processor.rank_index(self.index, persona, job)
+            documents = sorted(self._stats)
+        subs = self.processor.extract_subsections(ranked, query=self.processor.query_for(persona, job))
+        return self.processor.build_output(documents, persona, job, ranked, subs)
+
+    def watch(self, interval: float, stop: threading.Event):
+        while not stop.wait(interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Re-indexing {self.input_dir} failed: {e}")
+
+
+def _field(value, key):
+    # Accept both plain strings and the input.json shape, e.g. {"role": "..."}
+    if isinstance(value, dict):
+        return value.get(key, "")
+    return value or ""
+
+
+def make_handler(corpus: WarmCorpus):
+    class QueryHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/health":
+                self._send(404, {"error": "not found"})
+                return
+            self._send(200, {"documents": corpus.documents(), "sections": len(corpus.index)})
+
+        def do_POST(self):
+            if self.path != "/query":
+                self._send(404, {"error": "not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                persona = _field(request.get("persona"), "role")
+                job = _field(request.get("job_to_be_done"), "task")
+            except (ValueError, AttributeError) as e:
+                self._send(400, {"error": f"invalid request: {e}"})
+                return
+            try:
+                result = corpus.query(persona, job)
+            except Exception as e:
+                logger.exception("Query failed")
+                self._send(500, {"error": f"{type(e).__name__}: {e}"})
+                return
+            self._send(200, result)
+
+        def _send(self, status, body):
+            payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            logger.debug(format, *args)
+
+    return QueryHandler
+
+
+def main():
+    """
+    Serve persona/job queries against a document directory that is indexed once.
+    POST /query with {"persona": ..., "job_to_be_done": ...} returns the same
+    JSON shape process_documents writes to output.json.
+    """
+    parser = argparse.ArgumentParser(description="Warm persona-driven query server")
+    parser.add_argument("--input-dir", default=os.path.join(os.getcwd(), "input"))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="processes used to extract documents in parallel (default: CPU count)")
+    parser.add_argument("--cache", metavar="PATH", help="SQLite extraction cache")
+    parser.add_argument("--watch-interval", type=float, default=2.0,
+                        help="seconds between input directory scans; 0 disables watching")
+    args = parser.parse_args()
+
+    cache = ExtractionCache(args.cache) if args.cache else None
+    corpus = WarmCorpus(GenericDocumentIntelligence(workers=args.workers, cache=cache), args.input_dir)
+    corpus.refresh()
+
+    stop = threading.Event()
+    if args.watch_interval > 0:
+        threading.Thread(target=corpus.watch, args=(args.watch_interval, stop), daemon=True).start()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(corpus))
+    logger.info(f"Serving {args.input_dir} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+import glob
+import os
+
+import pytest
+
+from document_processor import GenericDocumentIntelligence
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PDFS = sorted(glob.glob(os.path.join(REPO, "input", "*.pdf")))
+
+pytestmark = pytest.mark.skipif(not PDFS, reason="no sample PDFs in input/")
+
+
+def test_pool_extraction_matches_serial():
+    serial = GenericDocumentIntelligence(workers=1).extract_documents(PDFS)
+    pooled = GenericDocumentIntelligence(workers=2).extract_documents(PDFS)
+    assert len(serial) == len(PDFS)
+    assert pooled == serial
@@ -0,0 +1,50 @@
+import fitz
+
+from core.extractor import extract_pdf_headings
+from core.font_profile import HEADING_MIN_SIZE, page_has_heading_candidates
+
+BODY = "Travellers follow the coast road past vineyards and small harbour towns"
+
+
+def _large_body_pdf(path):
+    """Four pages of 14pt regular body under a 15pt regular line, with an 18pt
+    regular heading on page 1 and a 9pt bold note on pages 2 and 4."""
+    doc = fitz.open()
+    for page_num in range(1, 5):
+        page = doc.new_page()
+        page.insert_text((72, 72), "Regional Overview", fontname="helv", fontsize=15)
+        if page_num == 1:
+            page.insert_text((72, 110), "Coastal Routes", fontname="helv", fontsize=18)
+        y = 140
+        for _ in range(20):
+            page.insert_text((72, y), BODY, fontname="helv", fontsize=14)
+            y += 22
+        if page_num % 2 == 0:
+            page.insert_text((72, y + 10), "Note", fontname="hebo", fontsize=9)
+    doc.save(str(path))
+    doc.close()
+
+
+def test_large_body_text_gets_the_same_decision_on_every_page(tmp_path):
+    path = tmp_path / "large_body.pdf"
+    _large_body_pdf(path)
+
+    headings = extract_pdf_headings(str(path))
+
+    by_text = {}
+    for heading in headings:
+        by_text.setdefault(heading["text"], []).append(heading["page"])
+    # The 15pt line is body-sized here, on pages pruning skips and on pages it
+    # keeps; a 9pt bold note is too small to be a heading
+    assert by_text == {"Coastal Routes": [1]}
+
+
+def test_page_pruning_is_exact_at_heading_min_size():
+    def blocks(size, font="Helvetica", text="Plain body text"):
+        return [{"lines": [{"spans": [{"text": text, "size": size, "font": font}]}]}]
+
+    assert page_has_heading_candidates(blocks(HEADING_MIN_SIZE))
+    assert not page_has_heading_candidates(blocks(HEADING_MIN_SIZE - 0.1))
+    assert page_has_heading_candidates(blocks(9, font="Helvetica-Bold"))
+    assert page_has_heading_candidates(blocks(9, text="Note: bring water"))
+    assert page_has_heading_candidates(blocks(9, text="2 Getting there"))
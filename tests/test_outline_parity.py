@@ -0,0 +1,32 @@
+import glob
+import os
+
+import pytest
+
+import main
+from document_processor import GenericDocumentIntelligence
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PDFS = sorted(glob.glob(os.path.join(REPO, "input", "*.pdf")))
+
+pytestmark = pytest.mark.skipif(not PDFS, reason="no sample PDFs in input/")
+
+
+def _outlines(run, output_dir, workers):
+    results = list(run(PDFS, output_dir, workers))
+    assert all(json_path is not None for _, json_path, _, _ in results)
+    return {os.path.basename(p): p.read_bytes() for p in sorted(output_dir.iterdir())}
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_async_pipeline_writes_the_same_outlines(tmp_path, workers):
+    sync = _outlines(main.run_outline_batch, tmp_path / "sync", workers)
+    pipelined = _outlines(main.run_outline_pipeline, tmp_path / "async", workers)
+    assert len(sync) == len(PDFS)
+    assert pipelined == sync
+
+
+def test_async_extraction_matches_serial():
+    serial = GenericDocumentIntelligence(workers=1).extract_documents(PDFS)
+    pipelined = GenericDocumentIntelligence(workers=2).extract_documents(PDFS, async_io=True)
+    assert pipelined == serial
@@ -0,0 +1,97 @@
+import json
+import os
+import random
+
+import pytest
+
+from document_processor import GenericDocumentIntelligence
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INPUT_DIR = os.path.join(REPO, "input")
+
+WORDS = "travel coast wine beach hotel budget museum market group friends trip days city food".split()
+PERSONA_JOBS = [
+    ("Travel Planner", "Plan a trip of 4 days for a group of 10 college friends."),
+    ("Food Critic", "Review wine and food markets on the coast in 3 days"),
+    ("Budget Traveller", "Find a cheap hotel near the beach"),
+]
+
+
+def _sections(count=200, seed=7):
+    # A small vocabulary and few length priors, so many sections tie on the rounded score
+    rng = random.Random(seed)
+    return [
+        {
+            "document": f"doc{i % 5}.pdf",
+            "page": i % 9 + 1,
+            "section_title": " ".join(rng.choices(WORDS, k=rng.randint(1, 3))).title(),
+            "content": " ".join(rng.choices(WORDS + ["the", "and", "a"], k=rng.choice([20, 57, 64, 131]))),
+        }
+        for i in range(count)
+    ]
+
+
+def _reference(processor, sections, persona, job, top_n):
+    # calculate_section_relevance with a stable sort, as ranking worked before the index
+    keywords = processor.extract_keywords_from_context(persona, job)
+    scored = [(processor.calculate_section_relevance(s, keywords, persona, job), s) for s in sections]
+    ranked = sorted(scored, key=lambda pair: -pair[0])[:top_n]
+    return [(s["document"], s["page"], s["section_title"]) for _, s in ranked]
+
+
+@pytest.mark.parametrize("top_n", [10, 50])
+def test_compat_mode_matches_calculate_section_relevance(top_n):
+    pytest.importorskip("scipy")
+    processor = GenericDocumentIntelligence()
+    sections = _sections()
+    results = processor.rank_many(sections, PERSONA_JOBS, top_n=top_n, mode="compat")
+    for (persona, job), ranked in zip(PERSONA_JOBS, results):
+        assert [(r.document, r.page_number, r.section_title) for r in ranked] == \
+            _reference(processor, sections, persona, job, top_n)
+
+
+def test_compat_mode_breaks_ties_by_position():
+    pytest.importorskip("scipy")
+    processor = GenericDocumentIntelligence()
+    # Different text, same keyword hits and length prior (3.0 + 2.0 + 0.57)
+    first = {"document": "a.pdf", "page": 1, "section_title": "Wine", "content": "wine " * 57}
+    second = {"document": "b.pdf", "page": 1, "section_title": "Wine", "content": "wine " * 56 + "coast"}
+    third = {"document": "c.pdf", "page": 1, "section_title": "Wine", "content": "wine " * 57}
+    [ranked] = processor.rank_many([first, second, third], [("Critic", "wine")], top_n=2, mode="compat")
+    assert [(r.document, r.importance_rank) for r in ranked] == [("a.pdf", 1), ("b.pdf", 2)]
+
+
+def test_rank_stream_matches_rank_sections_and_drops_failed_documents():
+    processor = GenericDocumentIntelligence()
+    sections = _sections()
+    persona, job = PERSONA_JOBS[0]
+
+    def failing(document):
+        yield from (s for s in sections if s["document"] == document)
+        raise OSError("truncated file")
+
+    def read_documents():
+        for document in ("doc0.pdf", "doc1.pdf", "doc2.pdf", "doc3.pdf", "doc4.pdf"):
+            if document == "doc2.pdf":
+                yield document, failing(document)
+            else:
+                yield document, (s for s in sections if s["document"] == document)
+
+    kept = [s for s in sections if s["document"] != "doc2.pdf"]
+    expected = processor.rank_sections(sorted(kept, key=lambda s: s["document"]), persona, job)
+    streamed = processor.rank_stream(read_documents, persona, job)
+    assert streamed == expected
+    assert list(processor.document_errors) == ["doc2.pdf"]
+
+
+@pytest.mark.skipif(not os.path.exists(os.path.join(INPUT_DIR, "input.json")), reason="no sample input")
+def test_streaming_ranks_like_the_default_path(tmp_path):
+    outputs = {}
+    for streaming in (False, True):
+        out_dir = tmp_path / str(streaming)
+        GenericDocumentIntelligence(workers=1).process_documents(INPUT_DIR, str(out_dir), streaming=streaming)
+        with open(out_dir / "output.json", encoding="utf-8") as f:
+            result = json.load(f)
+        result["metadata"].pop("processing_timestamp")
+        outputs[streaming] = result
+    assert outputs[True] == outputs[False]
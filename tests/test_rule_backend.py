@@ -0,0 +1,68 @@
+import pytest
+
+from nlp.rule_backend import MAIN_VERBS, _inflections, is_sentence_like
+
+
+@pytest.mark.parametrize("base, expected", [
+    ("plan", {"plans", "planned", "planning"}),
+    ("stop", {"stops", "stopped", "stopping"}),
+    ("shop", {"shops", "shopped", "shopping"}),
+    ("run", {"runs", "running"}),
+    ("get", {"gets", "getting"}),
+    ("sit", {"sits", "sitting"}),
+    ("put", {"puts", "putting"}),
+    ("set", {"sets", "setting"}),
+    ("begin", {"begins", "beginning"}),
+    ("see", {"sees", "seeing"}),
+    ("agree", {"agrees", "agreed", "agreeing"}),
+    ("visit", {"visits", "visited", "visiting"}),
+    ("cook", {"cooks", "cooked", "cooking"}),
+    ("try", {"tries", "tried", "trying"}),
+    ("make", {"makes", "making"}),
+])
+def test_inflections(base, expected):
+    assert _inflections(base) == {base} | expected
+
+
+@pytest.mark.parametrize("word", ["planing", "stoping", "seing", "seed", "runned", "haves"])
+def test_no_misspelled_or_noun_forms(word):
+    assert word not in MAIN_VERBS
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("We are planning a trip:", True),
+    ("We have a car:", True),
+    ("They agreed on the following:", True),
+    ("The group is seeing the sights:", True),
+    ("You can stop here:", True),
+    ("Prices are high:", False),
+    ("Consider the following:", False),
+    ("Places to visit:", False),
+    ("Things to do:", False),
+    ("Are planning:", False),
+    ("Tomato seed:", False),
+    ("Wine tasting:", False),
+    ("Museum visits:", False),
+    ("Special offers:", False),
+    ("Price changes:", False),
+    ("Beach walks:", False),
+    ("Family travel tips:", False),
+    ("Kids love the beach:", True),
+    ("Prices changed:", True),
+    ("Our guide offers tours:", True),
+])
+def test_is_sentence_like(text, expected):
+    assert is_sentence_like(text) is expected
+
+
+# Known disagreements with the spaCy backend (nsubj + a VERB token): verbs
+# outside the lexicon are missed, and a clause made only of bare nouns around a
+# noun-like verb form reads as a noun compound. Pinned so a lexicon or rule
+# change shows up here.
+@pytest.mark.parametrize("text", [
+    "The hotel is located near the port:",
+    "The city boasts beaches:",
+    "Kids visit museums:",
+])
+def test_known_divergences_from_spacy(text):
+    assert is_sentence_like(text) is False
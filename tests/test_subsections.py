@@ -0,0 +1,24 @@
+from core.sentence_index import best_windows, segment
+
+SECTIONS = [
+    "The harbour market opens early on weekdays. Fishing boats unload beside the quay. "
+    "Cafes along the front serve breakfast until noon. The old town climbs the hill behind it. "
+    "Narrow lanes lead up to the castle walls. The view covers the whole bay at sunset.",
+    "Trains leave the central station every hour. Tickets are cheaper when bought in advance. "
+    "The coastal line stops at every village on the way. Bicycles travel free outside rush hour.",
+]
+INDEXED = [(content, segment(content)) for content in SECTIONS]
+
+
+def test_matching_windows_come_first_then_reading_order():
+    windows = list(best_windows(INDEXED, {"tickets": (1.0, 1.0)}, limit=10))
+    assert windows[0] == (1, "Trains leave the central station every hour. Tickets are cheaper when bought "
+                             "in advance. The coastal line stops at every village on the way.")
+    assert [position for position, _ in windows[1:]] == [0, 0]
+    assert windows[1][1].startswith("The harbour market")
+    assert windows[2][1].startswith("The old town")
+
+
+def test_query_matching_nothing_still_fills_the_limit():
+    windows = list(best_windows(INDEXED, {"ledger": (1.0, 1.0)}, limit=2))
+    assert [position for position, _ in windows] == [0, 0]
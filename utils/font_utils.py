@@ -10,3 +10,13 @@ def has_similar_font_properties(span1, span2):
         span1.get("color") == span2.get("color") and
         is_normal1 and is_normal2
     )
+
+
+def spans_share_regular_style(span1, span2, fonts):
+    """has_similar_font_properties for core.spans.Span objects and their FontTable."""
+    return (
+        span1.font_id == span2.font_id and
+        span1.size == span2.size and
+        span1.color == span2.color and
+        not fonts.bold[span1.font_id]
+    )
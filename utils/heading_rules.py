@@ -1,10 +1,46 @@
 import re
-from nlp.sentence_detector import is_sentence_like
+from nlp.sentence_detector import is_sentence_like, is_sentence_like_batch
+
+# Rule: Structured pattern like "Section A: Something"
+STRUCTURED_HEADING_PATTERN = re.compile(r"^[A-Z][a-zA-Z]+\s+[A-Z0-9]+:\s?.+")
+# Rule: Numbered heading like "1. Introduction" or "2.3 Subsection"
+NUMBERED_HEADING_PATTERN = re.compile(r"^\d+(\.\d+)*\.?\s+[A-Z]")
+
+
+def _needs_sentence_check(text, is_bold):
+    """True when is_heading would have to ask the sentence detector about `text`."""
+    word_count = len(text.split())
+    return (
+        text.endswith(":") and
+        not is_bold and
+        word_count <= 10 and
+        not STRUCTURED_HEADING_PATTERN.match(text) and
+        not NUMBERED_HEADING_PATTERN.match(text)
+    )
+
+
+def prime_sentence_checks(candidates):
+    """Run every (text, font) pair that is_heading would send to the sentence
+    detector through one batched call, so the per-span checks hit the memo."""
+    texts = []
+    for text, font in candidates:
+        font = font.lower()
+        text = text.strip()
+        if _needs_sentence_check(text, "bold" in font or "black" in font):
+            texts.append(text)
+    if texts:
+        is_sentence_like_batch(texts)
+
 
 def is_heading(span):
-    font = span.get("font", "").lower()
-    size = span.get("size", 0)
-    text = span.get("text", "").strip()
+    return is_heading_style(span.get("text", ""), span.get("font", ""), span.get("size", 0))
+
+
+def is_heading_style(text, font, size, min_size=15):
+    """`min_size` is the size from which regular text is a heading on size
+    alone (see core.font_profile.FontProfile.heading_min_size)."""
+    font = font.lower()
+    text = text.strip()
     word_count = len(text.split())
     ends_with_colon = text.endswith(":")
     is_bold = "bold" in font or "black" in font
@@ -14,25 +50,23 @@ def is_heading(span):
         return False
 
     # Rule: Structured pattern like "Section A: Something"
-    structured_heading_pattern = r"^[A-Z][a-zA-Z]+\s+[A-Z0-9]+:\s?.+"
-    if re.match(structured_heading_pattern, text):
+    if STRUCTURED_HEADING_PATTERN.match(text):
         return True
 
     # Rule: Numbered heading like "1. Introduction" or "2.3 Subsection"
-    numbered_heading_pattern = r"^\d+(\.\d+)*\.?\s+[A-Z]"
-    if re.match(numbered_heading_pattern, text) and word_count <= 10:
+    if NUMBERED_HEADING_PATTERN.match(text) and word_count <= 10:
         return True
 
     # Rule: Ends with colon but shouldn't be a long sentence
     if ends_with_colon:
         if word_count > 10:
             return False
-        if is_sentence_like(text) and not is_bold:
+        if not is_bold and is_sentence_like(text):
             return False
 
     # General heuristics
     return (
-        size >= 15 or
+        size >= min_size or
         (is_bold and size >= 11 and word_count <= 12) or
         (ends_with_colon and word_count <= 10)
     )